@@ -26,6 +26,7 @@ if "bpy" in locals():
 
 import bpy  # noqa: E402
 import bpy_extras  # noqa: E402
+import math  # noqa: E402
 import typing  # noqa: E402
 
 
@@ -83,11 +84,149 @@ class TS1IOImport(bpy.types.Operator, bpy_extras.io_utils.ImportHelper):
         default=False,
     )
 
+    decode_textures_in_parallel: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Decode Textures in Parallel",
+        description="Decode the textures on all cores during the import instead of when they are first displayed",
+        default=False,
+    )
+
+    use_texture_proxies: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Texture Proxies",
+        description=(
+            "Use cached downscaled copies of large textures, which can be replaced with the full resolution textures "
+            "later from File -> External Data"
+        ),
+        default=False,
+    )
+
+    texture_proxy_size: bpy.props.IntProperty(  # type: ignore[valid-type]
+        name="Proxy Size",
+        description="Maximum width and height of the texture proxies",
+        default=128,
+        min=8,
+        max=4096,
+    )
+
+    reduce_keyframes: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Reduce Keyframes",
+        description="Remove keyframes that interpolation reproduces within the tolerances",
+        default=False,
+    )
+
+    rotation_tolerance: bpy.props.FloatProperty(  # type: ignore[valid-type]
+        name="Rotation Tolerance",
+        description="Maximum rotation error of a removed keyframe",
+        default=math.radians(0.1),
+        min=0.0,
+        max=math.radians(10.0),
+        subtype='ANGLE',
+    )
+
+    location_tolerance: bpy.props.FloatProperty(  # type: ignore[valid-type]
+        name="Location Tolerance",
+        description="Maximum location error of a removed keyframe",
+        default=0.0001,
+        min=0.0,
+        max=0.1,
+        precision=5,
+        subtype='DISTANCE',
+    )
+
+    scale_tolerance: bpy.props.FloatProperty(  # type: ignore[valid-type]
+        name="Scale Tolerance",
+        description="Maximum scale error of a removed keyframe",
+        default=0.0001,
+        min=0.0,
+        max=0.1,
+        precision=5,
+    )
+
+    skip_rest_pose_channels: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Skip Rest Pose Channels",
+        description=(
+            "Do not create fcurves for channels that stay at the rest pose within the tolerances. "
+            "Bones without fcurves keep the pose of the previously evaluated action"
+        ),
+        default=False,
+    )
+
+    bone_include: bpy.props.StringProperty(  # type: ignore[valid-type]
+        name="Include Bones",
+        description=(
+            "Comma separated bone name patterns to import animation channels for, or all bones if empty. "
+            "* and ? are wildcards and a leading > also matches every child bone"
+        ),
+        default="",
+    )
+
+    bone_exclude: bpy.props.StringProperty(  # type: ignore[valid-type]
+        name="Exclude Bones",
+        description=(
+            "Comma separated bone name patterns to skip animation channels for. "
+            "* and ? are wildcards and a leading > also matches every child bone"
+        ),
+        default="",
+    )
+
+    import_rotation: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Rotation",
+        description="Import animation rotation channels",
+        default=True,
+    )
+
+    import_scale: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Scale",
+        description="Import animation scale channels",
+        default=True,
+    )
+
+    import_location: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Location",
+        description="Import animation location channels",
+        default=True,
+    )
+
+    action_library: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Action Library",
+        description=(
+            "Keep imported animations as fake user actions instead of adding an NLA track for each of them. "
+            "Only the first animation of an armature gets an NLA strip"
+        ),
+        default=False,
+    )
+
+    use_frame_range: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Frame Range",
+        description="Only import the keyframes covering a frame range, without decompressing the rest of the animation",
+        default=False,
+    )
+
+    frame_start: bpy.props.IntProperty(  # type: ignore[valid-type]
+        name="Start",
+        description="First frame to import",
+        default=1,
+        min=1,
+    )
+
+    frame_end: bpy.props.IntProperty(  # type: ignore[valid-type]
+        name="End",
+        description="Last frame to import",
+        default=250,
+        min=1,
+    )
+
+    apply_to_selected: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Apply to Selected",
+        description="Apply imported animation files to every selected armature instead of only the active one",
+        default=False,
+    )
+
     def execute(self, context: bpy.context) -> set[str]:
         """Execute the importing function."""
         import io
         import logging
         import pathlib
+        from . import import_animation
         from . import import_files
 
         logger = logging.getLogger(__name__)
@@ -107,6 +246,24 @@ class TS1IOImport(bpy.types.Operator, bpy_extras.io_utils.ImportHelper):
             invert_normals=self.invert_normals,
             cleanup_meshes=self.cleanup_meshes,
             backface_culling=self.backface_culling,
+            decode_textures_in_parallel=self.decode_textures_in_parallel,
+            use_texture_proxies=self.use_texture_proxies,
+            texture_proxy_size=self.texture_proxy_size,
+            apply_to_selected=self.apply_to_selected,
+            animation_options=import_animation.AnimationOptions(
+                reduce_keyframes=self.reduce_keyframes,
+                rotation_tolerance=self.rotation_tolerance,
+                location_tolerance=self.location_tolerance,
+                scale_tolerance=self.scale_tolerance,
+                skip_rest_pose_channels=self.skip_rest_pose_channels,
+                action_library=self.action_library,
+                bone_include=import_animation.parse_bone_patterns(self.bone_include),
+                bone_exclude=import_animation.parse_bone_patterns(self.bone_exclude),
+                import_rotation=self.import_rotation,
+                import_scale=self.import_scale,
+                import_location=self.import_location,
+                frame_range=(self.frame_start, max(self.frame_start, self.frame_end)) if self.use_frame_range else None,
+            ),
         )
 
         log_output = log_stream.getvalue()
@@ -123,25 +280,357 @@ class TS1IOImport(bpy.types.Operator, bpy_extras.io_utils.ImportHelper):
         col.prop(self, "invert_normals")
         col.prop(self, "cleanup_meshes")
         col.prop(self, "backface_culling")
+        col.prop(self, "decode_textures_in_parallel")
+        col.prop(self, "use_texture_proxies")
+        sub = col.column()
+        sub.active = self.use_texture_proxies
+        sub.prop(self, "texture_proxy_size")
+
+        col = self.layout.column(heading="Animation")
+        col.prop(self, "apply_to_selected")
+        col.prop(self, "action_library")
+        col.prop(self, "reduce_keyframes")
+        col.prop(self, "skip_rest_pose_channels")
+        sub = col.column()
+        sub.active = self.reduce_keyframes or self.skip_rest_pose_channels
+        sub.prop(self, "rotation_tolerance")
+        sub.prop(self, "location_tolerance")
+        sub.prop(self, "scale_tolerance")
+        col.prop(self, "bone_include")
+        col.prop(self, "bone_exclude")
+        row = col.row(heading="Channels")
+        row.prop(self, "import_rotation", toggle=True)
+        row.prop(self, "import_scale", toggle=True)
+        row.prop(self, "import_location", toggle=True)
+        col.prop(self, "use_frame_range")
+        sub = col.column(align=True)
+        sub.active = self.use_frame_range
+        sub.prop(self, "frame_start")
+        sub.prop(self, "frame_end")
+
+
+ACTION_ITEMS: list[tuple[str, str, str]] = []
+
+
+def get_action_items(_: bpy.types.Operator, context: bpy.types.Context) -> list[tuple[str, str, str]]:
+    """Get the library actions that can be added to the active armature."""
+    from . import import_animation
+
+    # blender requires the enum item strings to stay referenced from python
+    ACTION_ITEMS.clear()
+
+    armature_object = context.view_layer.objects.active
+    if armature_object is not None and armature_object.type == 'ARMATURE':
+        ACTION_ITEMS.extend((x.name, x.name, "") for x in import_animation.get_library_actions(armature_object))
+
+    return ACTION_ITEMS
+
+
+class TS1IOAddAnimationStrip(bpy.types.Operator):
+    """Add an NLA strip of an imported animation to the active armature."""
+
+    bl_idname: str = "object.tsc_add_animation_strip"
+    bl_label: str = "Add The Sims Animation Strip"
+    bl_description: str = "Add an NLA strip of an imported animation from the action library at the current frame"
+    bl_options: typing.ClassVar[set[str]] = {'REGISTER', 'UNDO'}
+    bl_property: str = "action"
+
+    action: bpy.props.EnumProperty(  # type: ignore[valid-type]
+        name="Action",
+        description="Imported animation to add",
+        items=get_action_items,
+    )
+
+    @classmethod
+    def poll(cls, context: bpy.types.Context) -> bool:
+        """Check for an active armature."""
+        return context.view_layer.objects.active is not None and context.view_layer.objects.active.type == 'ARMATURE'
+
+    def invoke(self, context: bpy.types.Context, _: bpy.types.Event) -> set[str]:
+        """Search for the action to add."""
+        context.window_manager.invoke_search_popup(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context: bpy.types.Context) -> set[str]:
+        """Add the strip."""
+        from . import import_animation
+
+        action = bpy.data.actions.get(self.action)
+        if action is None:
+            return {'CANCELLED'}
+
+        armature_object = context.view_layer.objects.active
+        anim_data = armature_object.animation_data_create()
+        import_animation.add_animation_track(anim_data, action, context.scene.frame_current)
+
+        context.scene.frame_end = max(context.scene.frame_end, context.scene.frame_current + int(action.frame_range[1]))
+
+        return {'FINISHED'}
+
+
+class TS1IOBuildCatalog(bpy.types.Operator):
+    """Build the asset catalog of an extracted game operator."""
+
+    bl_idname: str = "import.tsc_build_catalog"
+    bl_label: str = "The Sims Console Asset Catalog"
+    bl_description: str = (
+        "Parse the models, characters, animations, shaders and textures of an extracted game folder "
+        "in to a searchable catalog"
+    )
+
+    directory: bpy.props.StringProperty(  # type: ignore[valid-type]
+        subtype='DIR_PATH',
+    )
+
+    def invoke(self, context: bpy.types.Context, _: bpy.types.Event) -> set[str]:
+        """Select the game folder."""
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, _: bpy.types.Context) -> set[str]:
+        """Build the catalog."""
+        import io
+        import logging
+        import pathlib
+        from . import catalog
+
+        logger = logging.getLogger(__name__)
+        logger.setLevel(logging.DEBUG)
+        log_stream = io.StringIO()
+        logger.addHandler(logging.StreamHandler(stream=log_stream))
+
+        catalog_file_path = catalog.build_catalog(logger, pathlib.Path(self.directory))
+
+        log_output = log_stream.getvalue()
+        if log_output != "":
+            self.report({"ERROR"}, log_output)
+
+        self.report({"INFO"}, f"Built catalog {catalog_file_path}")
+
+        return {'FINISHED'}
+
+
+class TS1IOImportFromCatalog(bpy.types.Operator):
+    """Import the models found in the asset catalog of an extracted game operator."""
+
+    bl_idname: str = "import.tsc_catalog_models"
+    bl_label: str = "The Sims Console Models from Catalog"
+    bl_description: str = (
+        "Import the models of an extracted game folder found in its catalog by their name "
+        "or the names of the animations, characters or textures they use"
+    )
+    bl_options: typing.ClassVar[set[str]] = {'UNDO'}
+
+    directory: bpy.props.StringProperty(  # type: ignore[valid-type]
+        subtype='DIR_PATH',
+    )
+
+    search_by: bpy.props.EnumProperty(  # type: ignore[valid-type]
+        name="Search By",
+        description="Names the pattern is matched against",
+        items=[
+            ('MODEL', "Model", "Find models by their name"),
+            ('ANIMATION', "Animation", "Find the models whose objects use matching animations"),
+            ('CHARACTER', "Character", "Find the models that use matching characters"),
+            ('TEXTURE', "Texture", "Find the models with meshes that use matching textures"),
+        ],
+        default='MODEL',
+    )
+
+    pattern: bpy.props.StringProperty(  # type: ignore[valid-type]
+        name="Pattern",
+        description="Name to search for, with * and ? wildcards",
+        default="*",
+    )
+
+    import_animations: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Import Skeletons and Animations",
+        description="Import skeletons and animations for models",
+        default=True,
+    )
+
+    def invoke(self, context: bpy.types.Context, _: bpy.types.Event) -> set[str]:
+        """Select the game folder."""
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context: bpy.types.Context) -> set[str]:
+        """Import the models found in the catalog."""
+        import contextlib
+        import io
+        import logging
+        import pathlib
+        from . import catalog
+        from . import import_animation
+        from . import import_files
+
+        connection = catalog.open_catalog(pathlib.Path(self.directory))
+        if connection is None:
+            self.report({"ERROR"}, f"No catalog of {self.directory}, build it first")
+            return {'CANCELLED'}
+
+        with contextlib.closing(connection):
+            paths = catalog.find_models(connection, self.search_by, self.pattern)
+
+        if not paths:
+            self.report({"ERROR"}, f"Could not find any models matching {self.pattern}")
+            return {'CANCELLED'}
+
+        logger = logging.getLogger(__name__)
+        logger.setLevel(logging.DEBUG)
+        log_stream = io.StringIO()
+        logger.addHandler(logging.StreamHandler(stream=log_stream))
+
+        import_files.import_files(
+            context,
+            logger,
+            paths,
+            import_animations=self.import_animations,
+            flip_normals_x_axis=False,
+            invert_normals=False,
+            cleanup_meshes=False,
+            backface_culling=False,
+            decode_textures_in_parallel=False,
+            use_texture_proxies=False,
+            texture_proxy_size=128,
+            apply_to_selected=False,
+            animation_options=import_animation.AnimationOptions(),
+        )
+
+        log_output = log_stream.getvalue()
+        if log_output != "":
+            self.report({"ERROR"}, log_output)
+
+        self.report({"INFO"}, f"Imported {len(paths)} models")
+
+        return {'FINISHED'}
+
+    def draw(self, _: bpy.context) -> None:
+        """Draw the search options ui."""
+        col = self.layout.column()
+        col.prop(self, "search_by")
+        col.prop(self, "pattern")
+        col.prop(self, "import_animations")
+
+
+class TS1IOBuildShaderTable(bpy.types.Operator):
+    """Build the shader table of an extracted game operator."""
+
+    bl_idname: str = "import.tsc_build_shader_table"
+    bl_label: str = "The Sims Console Shader Table"
+    bl_description: str = (
+        "Read every shader of an extracted game folder at once, so importing models does not read shader files"
+    )
+
+    directory: bpy.props.StringProperty(  # type: ignore[valid-type]
+        subtype='DIR_PATH',
+    )
+
+    def invoke(self, context: bpy.types.Context, _: bpy.types.Event) -> set[str]:
+        """Select the game folder."""
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, _: bpy.types.Context) -> set[str]:
+        """Build the shader table."""
+        import pathlib
+        from . import game_root
+        from . import shader_table
+
+        game_root_index = game_root.get_game_root_index(pathlib.Path(self.directory))
+
+        game_type = shader_table.detect_game_type(game_root_index)
+        if game_type is None:
+            self.report({"ERROR"}, f"Could not find any models in {self.directory}")
+            return {'CANCELLED'}
+
+        entries = shader_table.create_shader_table(game_root_index, *game_type)
+
+        self.report({"INFO"}, f"Built shader table of {len(entries)} shaders")
+
+        return {'FINISHED'}
+
+
+class TS1IOLoadFullResolutionTextures(bpy.types.Operator):
+    """Replace texture proxies with full resolution textures operator."""
+
+    bl_idname: str = "file.tsc_load_full_resolution_textures"
+    bl_label: str = "Load Full Resolution The Sims Textures"
+    bl_description: str = "Replace the texture proxies of imported materials with the full resolution textures"
+    bl_options: typing.ClassVar[set[str]] = {'REGISTER', 'UNDO'}
+
+    selected_only: bpy.props.BoolProperty(  # type: ignore[valid-type]
+        name="Selected Only",
+        description="Only replace the texture proxies of the materials of the selected objects",
+        default=False,
+    )
+
+    def execute(self, context: bpy.types.Context) -> set[str]:
+        """Replace the texture proxies."""
+        from . import import_texture
+
+        if self.selected_only:
+            materials = {x.material for obj in context.selected_objects for x in obj.material_slots if x.material}
+        else:
+            materials = bpy.data.materials
+
+        replaced_count = import_texture.load_full_resolution_images(materials)
+
+        self.report({"INFO"}, f"Replaced {replaced_count} texture proxies")
+
+        return {'FINISHED'}
 
 
 def menu_import(self: bpy.types.TOPBAR_MT_file_import, _: bpy.context) -> None:
     """Add an entry to the import menu."""
     self.layout.operator(TS1IOImport.bl_idname)
+    self.layout.operator(TS1IOBuildCatalog.bl_idname)
+    self.layout.operator(TS1IOImportFromCatalog.bl_idname)
+    self.layout.operator(TS1IOBuildShaderTable.bl_idname)
+
+
+def menu_animation(self: bpy.types.VIEW3D_MT_object_animation, _: bpy.context) -> None:
+    """Add an entry to the object animation menu."""
+    self.layout.operator(TS1IOAddAnimationStrip.bl_idname)
+
+
+def menu_external_data(self: bpy.types.TOPBAR_MT_file_external_data, _: bpy.context) -> None:
+    """Add entries to the external data menu."""
+    self.layout.separator()
+    self.layout.operator(TS1IOLoadFullResolutionTextures.bl_idname)
+    operator = self.layout.operator(
+        TS1IOLoadFullResolutionTextures.bl_idname,
+        text="Load Full Resolution The Sims Textures (Selected)",
+    )
+    operator.selected_only = True
 
 
 def register() -> None:
     """Register with Blender."""
     bpy.utils.register_class(TS1IOImport)
+    bpy.utils.register_class(TS1IOAddAnimationStrip)
+    bpy.utils.register_class(TS1IOBuildCatalog)
+    bpy.utils.register_class(TS1IOImportFromCatalog)
+    bpy.utils.register_class(TS1IOBuildShaderTable)
+    bpy.utils.register_class(TS1IOLoadFullResolutionTextures)
 
     bpy.types.TOPBAR_MT_file_import.append(menu_import)
+    bpy.types.VIEW3D_MT_object_animation.append(menu_animation)
+    bpy.types.TOPBAR_MT_file_external_data.append(menu_external_data)
 
 
 def unregister() -> None:
     """Unregister with Blender."""
     bpy.utils.unregister_class(TS1IOImport)
+    bpy.utils.unregister_class(TS1IOAddAnimationStrip)
+    bpy.utils.unregister_class(TS1IOBuildCatalog)
+    bpy.utils.unregister_class(TS1IOImportFromCatalog)
+    bpy.utils.unregister_class(TS1IOBuildShaderTable)
+    bpy.utils.unregister_class(TS1IOLoadFullResolutionTextures)
 
     bpy.types.TOPBAR_MT_file_import.remove(menu_import)
+    bpy.types.VIEW3D_MT_object_animation.remove(menu_animation)
+    bpy.types.TOPBAR_MT_file_external_data.remove(menu_external_data)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 """Read animation files."""
 
-import ctypes
+import bisect
 import dataclasses
-import math
-import mathutils
+import enum
+import hashlib
+import numpy as np
 import pathlib
 import struct
 import typing
@@ -13,22 +14,67 @@ from . import bit_array
 from . import utils
 
 
+FRAME_TABLE_STRIDE = 64
+
+
+class TrackType(enum.Enum):
+    """Compressed Track Type."""
+
+    QUATERNION = 0
+    QUATERNION_1_DOF = 1
+    VECTOR = 2
+
+
 @dataclasses.dataclass
-class QuaternionKeyframe:
-    """Quaternion Keyframe."""
+class TrackLayout:
+    """Position and record format of a compressed track in the stream data."""
 
-    frame: int
-    bias: float
-    rotation: mathutils.Quaternion
+    track_type: TrackType
+    offset: int
+    record_width: int
+    keyframe_count: int
+    delta_time_bit_count: int
+    bias_bit_count: int
+    bias_scale: float
+    element_bit_count: int
+    element_scales: tuple[float, ...]
+    element_offsets: tuple[float, ...]
+    axis: tuple[float, float, float]
+    has_unknown_bit: bool
+    frame_count_multiplier: int
+    frame_table: list[int] | None = None
 
 
-def decompress_quaternion_keyframes(
+def get_record_indices(layout: TrackLayout, first: int, last: int) -> np.ndarray:
+    """Get the bit index of every record of a track in a range."""
+    return layout.offset + (np.arange(first, last, dtype=np.int64) * layout.record_width)
+
+
+def get_delta_times(stream_data: bit_array.BitArray, layout: TrackLayout, first: int, last: int) -> np.ndarray:
+    """Get the delta times of the records of a track in a range."""
+    return stream_data.get_bits_unsigned_array(get_record_indices(layout, first, last), layout.delta_time_bit_count)
+
+
+def get_frame_table(stream_data: bit_array.BitArray, layout: TrackLayout) -> list[int]:
+    """Get a sparse table of the frame count before every FRAME_TABLE_STRIDE-th record of a track.
+
+    The table is created the first time a range of the track is read, so tracks that are read in full never need it.
+    """
+    if layout.frame_table is None:
+        frame_counts = np.cumsum(get_delta_times(stream_data, layout, 0, layout.keyframe_count) + 1)
+        frame_counts = np.concatenate(([0], frame_counts[:-1]))
+        layout.frame_table = frame_counts[::FRAME_TABLE_STRIDE].tolist()
+
+    return layout.frame_table
+
+
+def read_quaternion_track_layout(
     stream_data: bit_array.BitArray,
     index: int,
     fps: float,
     game_type: utils.GameType,
-) -> list[QuaternionKeyframe]:
-    """Decompress quaternion keyframes."""
+) -> TrackLayout:
+    """Read the layout of a quaternion track."""
     index = -index
 
     keyframe_count = stream_data.get_bits_unsigned(index, 20)
@@ -47,82 +93,35 @@ def decompress_quaternion_keyframes(
 
     quaternion_scale = stream_data.signed_bits_to_float_scaler(quaternion_bit_count)
 
-    frame_count_multiplier = 1 if fps == 60.0 else 2
-
-    frame_count = 0
-    keyframes = []
-
-    for _ in range(keyframe_count):
-        delta_time = stream_data.get_bits_unsigned(index, delta_time_bit_count)
-        index += delta_time_bit_count
-
-        bias = bias_scale * float(stream_data.get_bits_signed(index, bias_bit_count)) if bias_bit_count > 0 else 0.0
-        index += bias_bit_count
-
-        if game_type in (utils.GameType.THESIMS2PETS, utils.GameType.THESIMS2CASTAWAY, utils.GameType.THESIMS3):
-            # skip unknown bit
-            index += 1
-
-            quat = [0.0, 0.0, 0.0, 0.0]
-            for i in range(3):
-                quat[i] = quaternion_scale * stream_data.get_bits_signed(index, quaternion_bit_count)
-                index += quaternion_bit_count
-
-            quat[3] = 1.0 - ((quat[1] * quat[1]) + (quat[2] * quat[2]) + (quat[3] * quat[3]))
-
-            negate_x = stream_data.get_bit(index)
-            index += 1
-
-            if quat[3] > 0.0:
-                quat[3] = math.sqrt(quat[3])
-
-                if negate_x:
-                    quat[3] = -quat[3]
-            else:
-                quat[3] = 0.0
-
-            quat = [quat[3], quat[0], quat[1], quat[2]]
-
-        else:
-            quat = [0.0, 0.0, 0.0, 0.0]
-            for i in range(1, 4):
-                quat[i] = quaternion_scale * stream_data.get_bits_signed(index, quaternion_bit_count)
-                index += quaternion_bit_count
-
-            quat[0] = 1.0 - ((quat[1] * quat[1]) + (quat[2] * quat[2]) + (quat[3] * quat[3]))
-
-            negate_x = stream_data.get_bit(index)
-            index += 1
-
-            if quat[0] > 0.0:
-                quat[0] = math.sqrt(quat[0])
-
-                if negate_x:
-                    quat[0] = -quat[0]
-            else:
-                quat[0] = 0.0
-
-            quat = [quat[3], quat[0], quat[1], quat[2]]
-
-        frame_count += delta_time + 1
-
-        keyframes.append(
-            QuaternionKeyframe(
-                (frame_count * frame_count_multiplier) - 1,
-                bias,
-                mathutils.Quaternion(quat).normalized(),
-            ),
-        )
+    has_unknown_bit = game_type in (
+        utils.GameType.THESIMS2PETS,
+        utils.GameType.THESIMS2CASTAWAY,
+        utils.GameType.THESIMS3,
+    )
 
-    return keyframes
+    record_width = delta_time_bit_count + bias_bit_count + (3 * quaternion_bit_count) + 1
+    if has_unknown_bit:
+        record_width += 1
+
+    return TrackLayout(
+        TrackType.QUATERNION,
+        index,
+        record_width,
+        keyframe_count,
+        delta_time_bit_count,
+        bias_bit_count,
+        bias_scale,
+        quaternion_bit_count,
+        (quaternion_scale,) * 3,
+        (0.0,) * 3,
+        (0.0, 0.0, 0.0),
+        has_unknown_bit,
+        1 if fps == 60.0 else 2,
+    )
 
 
-def decompress_quaternion_1_dof_keyframes(
-    stream_data: bit_array.BitArray,
-    index: int,
-    fps: float,
-) -> list[QuaternionKeyframe]:
-    """Decompress quaternion 1 dof keyframes."""
+def read_quaternion_1_dof_track_layout(stream_data: bit_array.BitArray, index: int, fps: float) -> TrackLayout:
+    """Read the layout of a quaternion 1 dof track."""
     index = -index
 
     x = stream_data.get_float(index)
@@ -165,57 +164,30 @@ def decompress_quaternion_1_dof_keyframes(
         element_offset = stream_data.get_float(index)
         index += 32
 
-    frame_count_multiplier = 1 if fps == 60.0 else 2
-
-    frame_count = 0
-    keyframes = []
-
-    for _ in range(keyframe_count):
-        delta_time = stream_data.get_bits_unsigned(index, delta_time_bit_count)
-        index += delta_time_bit_count
-
-        bias = bias_scale * float(stream_data.get_bits_signed(index, bias_bit_count))
-        index += bias_bit_count
-
-        if element_bit_count == 32:
-            element = stream_data.get_float(index)
-            index += 32
-        else:
-            element = element_offset + (element_scale * stream_data.get_bits_unsigned(index, element_bit_count))
-            index += element_bit_count
-
-        sin = math.sin(0.5 * element)
-        w = math.cos(0.5 * element)
-
-        frame_count += delta_time + 1
-
-        keyframes.append(
-            QuaternionKeyframe(
-                (frame_count * frame_count_multiplier) - 1,
-                bias,
-                mathutils.Quaternion((w, x * sin, y * sin, z * sin)).normalized(),
-            ),
-        )
-
-    return keyframes
-
-
-@dataclasses.dataclass
-class VectorKeyframe:
-    """Vector Keyframe."""
-
-    frame: int
-    bias: float
-    vector: mathutils.Vector
+    return TrackLayout(
+        TrackType.QUATERNION_1_DOF,
+        index,
+        delta_time_bit_count + bias_bit_count + element_bit_count,
+        keyframe_count,
+        delta_time_bit_count,
+        bias_bit_count,
+        bias_scale,
+        element_bit_count,
+        (element_scale,),
+        (element_offset,),
+        (x, y, z),
+        False,  # noqa: FBT003
+        1 if fps == 60.0 else 2,
+    )
 
 
-def decompress_vector_keyframes(
+def read_vector_track_layout(
     stream_data: bit_array.BitArray,
     index: int,
     fps: float,
     game_type: utils.GameType,
-) -> list[VectorKeyframe]:
-    """Decompress vector keyframes."""
+) -> TrackLayout:
+    """Read the layout of a vector track."""
     index = -index
 
     keyframe_count = stream_data.get_bits_unsigned(index, 20)
@@ -243,59 +215,305 @@ def decompress_vector_keyframes(
         offset[i] = stream_data.get_float(index)
         index += 32
 
-    frame_count_multiplier = 1 if fps == 60.0 else 2
+    has_unknown_bit = game_type in (
+        utils.GameType.THESIMS2PETS,
+        utils.GameType.THESIMS2CASTAWAY,
+        utils.GameType.THESIMS3,
+    )
+
+    record_width = delta_time_bit_count + bias_bit_count + (3 * vector_bit_count)
+    if has_unknown_bit:
+        record_width += 1
+
+    return TrackLayout(
+        TrackType.VECTOR,
+        index,
+        record_width,
+        keyframe_count,
+        delta_time_bit_count,
+        bias_bit_count,
+        bias_scale,
+        vector_bit_count,
+        tuple(scale),
+        tuple(offset),
+        (0.0, 0.0, 0.0),
+        has_unknown_bit,
+        1 if fps == 60.0 else 2,
+    )
 
-    frame_count = 0
-    keyframes = []
 
-    for _ in range(keyframe_count):
-        delta_time = stream_data.get_bits_unsigned(index, delta_time_bit_count)
-        index += delta_time_bit_count
+def get_record_frame_count(stream_data: bit_array.BitArray, layout: TrackLayout, record_index: int) -> int:
+    """Get the frame count before a record, starting from the nearest frame table entry."""
+    if record_index == 0:
+        return 0
 
-        bias = bias_scale * float(stream_data.get_bits_unsigned(index, bias_bit_count)) if bias_bit_count > 0 else 0.0
-        index += bias_bit_count
+    table_index = record_index // FRAME_TABLE_STRIDE
+    frame_count = get_frame_table(stream_data, layout)[table_index]
 
-        if game_type in (utils.GameType.THESIMS2PETS, utils.GameType.THESIMS2CASTAWAY, utils.GameType.THESIMS3):
-            # skip unknown bit
-            index += 1
+    delta_times = get_delta_times(stream_data, layout, table_index * FRAME_TABLE_STRIDE, record_index)
+
+    return frame_count + int(delta_times.sum()) + len(delta_times)
+
+
+def find_record_range(
+    stream_data: bit_array.BitArray,
+    layout: TrackLayout,
+    frame_start: int,
+    frame_end: int,
+) -> tuple[int, int]:
+    """Find the records of a track covering a frame range, including the keyframes either side of it."""
+    if layout.keyframe_count == 0:
+        return 0, 0
+
+    frame_count_start = (frame_start + 1) / layout.frame_count_multiplier
+    frame_count_end = (frame_end + 1) / layout.frame_count_multiplier
+
+    frame_table = get_frame_table(stream_data, layout)
+
+    table_index = max(bisect.bisect_right(frame_table, frame_count_start) - 1, 0)
+
+    # the first table entry at or after the end is the frame count of a record at or after the end, so the chunks
+    # after it are not scanned
+    end_table_index = max(bisect.bisect_left(frame_table, frame_count_end), table_index + 1)
+
+    record_start = table_index * FRAME_TABLE_STRIDE
+    record_end = min(end_table_index * FRAME_TABLE_STRIDE, layout.keyframe_count)
+    frame_counts = frame_table[table_index] + np.cumsum(
+        get_delta_times(stream_data, layout, record_start, record_end) + 1,
+    )
+
+    # the frame table entry is the frame count of the record before the chunk, which is the earliest it can start at
+    first = max(record_start + int(np.searchsorted(frame_counts, frame_count_start, side='right')) - 1, 0)
+
+    end_index = int(np.searchsorted(frame_counts, frame_count_end, side='left'))
+    last = min(record_start + end_index + 1, layout.keyframe_count)
+
+    return first, last
+
+
+@dataclasses.dataclass(slots=True)
+class Track:
+    """Keyframe track stored as parallel arrays.
+
+    Frames are int32 with shape (N,), biases are float32 with shape (N,) and values are float32 with shape (N, 4) for
+    wxyz quaternions or (N, 3) for vectors.
+    """
+
+    frames: np.ndarray
+    biases: np.ndarray
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        """Get the keyframe count."""
+        return len(self.frames)
+
+
+def create_static_track(values: typing.Sequence[float]) -> Track:
+    """Create a track with a single keyframe at the first frame."""
+    return Track(
+        np.zeros(1, dtype=np.int32),
+        np.ones(1, dtype=np.float32),
+        np.array([values], dtype=np.float32),
+    )
+
+
+def create_empty_track(element_count: int) -> Track:
+    """Create a track without keyframes."""
+    return Track(
+        np.zeros(0, dtype=np.int32),
+        np.zeros(0, dtype=np.float32),
+        np.zeros((0, element_count), dtype=np.float32),
+    )
+
+
+def accumulate_frames(delta_times: np.ndarray, frame_count: int, frame_count_multiplier: int) -> np.ndarray:
+    """Convert record delta times to keyframe frames."""
+    frame_counts = np.cumsum(delta_times + 1) + frame_count
+    return ((frame_counts * frame_count_multiplier) - 1).astype(np.int32)
+
+
+def normalize_quaternions(quaternions: np.ndarray) -> np.ndarray:
+    """Normalize an (N, 4) array of quaternions."""
+    lengths = np.linalg.norm(quaternions, axis=1, keepdims=True)
+    lengths[lengths == 0.0] = 1.0
+    return quaternions / lengths
+
+
+def decompress_quaternion_keyframes(
+    stream_data: bit_array.BitArray,
+    layout: TrackLayout,
+    first: int,
+    last: int,
+) -> Track:
+    """Decompress quaternion keyframes."""
+    quaternion_bit_count = layout.element_bit_count
+
+    frame_count = get_record_frame_count(stream_data, layout, first)
+    index = get_record_indices(layout, first, last)
+
+    delta_times = stream_data.get_bits_unsigned_array(index, layout.delta_time_bit_count)
+    index = index + layout.delta_time_bit_count
+
+    biases = stream_data.get_bits_signed_array(index, layout.bias_bit_count)
+    index = index + layout.bias_bit_count
+
+    if layout.has_unknown_bit:
+        # skip unknown bit
+        index = index + 1
+
+    elements = np.empty((len(index), 3), dtype=np.float64)
+    for i in range(3):
+        elements[:, i] = stream_data.get_bits_signed_array(index, quaternion_bit_count)
+        index = index + quaternion_bit_count
+    elements *= layout.element_scales[0]
+
+    negate = stream_data.get_bits_unsigned_array(index, 1) != 0
+
+    if layout.has_unknown_bit:
+        # the elements are xyz, but w is calculated from y and z only
+        w = 1.0 - (np.square(elements[:, 1]) + np.square(elements[:, 2]))
+    else:
+        w = 1.0 - np.square(elements).sum(axis=1)
+
+    w = np.where(w > 0.0, np.sqrt(np.maximum(w, 0.0)), 0.0)
+    w = np.where(negate & (w > 0.0), -w, w)
 
-        vector = [0.0, 0.0, 0.0]
-        for i in range(3):
-            if vector_bit_count == 32:
-                value = stream_data.get_float(index)
-            else:
-                value = stream_data.get_bits_unsigned(index, vector_bit_count)
-            index += vector_bit_count
+    quaternions = np.empty((len(w), 4), dtype=np.float64)
+    if layout.has_unknown_bit:
+        quaternions[:, 0] = w
+        quaternions[:, 1:] = elements
+    else:
+        quaternions[:, 0] = elements[:, 2]
+        quaternions[:, 1] = w
+        quaternions[:, 2:] = elements[:, :2]
+
+    return Track(
+        accumulate_frames(delta_times, frame_count, layout.frame_count_multiplier),
+        (biases * layout.bias_scale).astype(np.float32),
+        normalize_quaternions(quaternions).astype(np.float32),
+    )
+
+
+def decompress_quaternion_1_dof_keyframes(
+    stream_data: bit_array.BitArray,
+    layout: TrackLayout,
+    first: int,
+    last: int,
+) -> Track:
+    """Decompress quaternion 1 dof keyframes."""
+    element_bit_count = layout.element_bit_count
+
+    frame_count = get_record_frame_count(stream_data, layout, first)
+    index = get_record_indices(layout, first, last)
+
+    delta_times = stream_data.get_bits_unsigned_array(index, layout.delta_time_bit_count)
+    index = index + layout.delta_time_bit_count
+
+    biases = stream_data.get_bits_signed_array(index, layout.bias_bit_count)
+    index = index + layout.bias_bit_count
+
+    if element_bit_count == 32:
+        elements = stream_data.get_float_array(index)
+    else:
+        elements = stream_data.get_bits_unsigned_array(index, element_bit_count).astype(np.float64)
+        elements = layout.element_offsets[0] + (layout.element_scales[0] * elements)
+
+    half_angles = 0.5 * elements
 
-            value = float(value & 1 | value >> 2) if ctypes.c_int32(value).value < 0 else float(value)
+    quaternions = np.empty((len(elements), 4), dtype=np.float64)
+    quaternions[:, 0] = np.cos(half_angles)
+    quaternions[:, 1:] = np.sin(half_angles)[:, np.newaxis] * np.array(layout.axis)
 
-            vector[i] = (value * scale[i]) + offset[i]
+    return Track(
+        accumulate_frames(delta_times, frame_count, layout.frame_count_multiplier),
+        (biases * layout.bias_scale).astype(np.float32),
+        normalize_quaternions(quaternions).astype(np.float32),
+    )
+
+
+def decompress_vector_keyframes(
+    stream_data: bit_array.BitArray,
+    layout: TrackLayout,
+    first: int,
+    last: int,
+) -> Track:
+    """Decompress vector keyframes."""
+    vector_bit_count = layout.element_bit_count
+
+    frame_count = get_record_frame_count(stream_data, layout, first)
+    index = get_record_indices(layout, first, last)
 
-        frame_count += delta_time + 1
+    delta_times = stream_data.get_bits_unsigned_array(index, layout.delta_time_bit_count)
+    index = index + layout.delta_time_bit_count
 
-        keyframes.append(VectorKeyframe((frame_count * frame_count_multiplier) - 1, bias, mathutils.Vector(vector)))
+    biases = stream_data.get_bits_unsigned_array(index, layout.bias_bit_count)
+    index = index + layout.bias_bit_count
 
-    return keyframes
+    if layout.has_unknown_bit:
+        # skip unknown bit
+        index = index + 1
+
+    elements = np.empty((len(index), 3), dtype=np.float64)
+    for i in range(3):
+        if vector_bit_count == 32:
+            elements[:, i] = stream_data.get_float_array(index)
+        else:
+            elements[:, i] = stream_data.get_bits_unsigned_array(index, vector_bit_count)
+        index = index + vector_bit_count
+
+    vectors = (elements * np.array(layout.element_scales)) + np.array(layout.element_offsets)
+
+    return Track(
+        accumulate_frames(delta_times, frame_count, layout.frame_count_multiplier),
+        (biases * layout.bias_scale).astype(np.float32),
+        vectors.astype(np.float32),
+    )
+
+
+def decompress_keyframes(
+    stream_data: bit_array.BitArray,
+    layout: TrackLayout,
+    frame_range: tuple[int, int] | None,
+) -> Track:
+    """Decompress all the keyframes of a track, or only those covering a frame range."""
+    if frame_range is None:
+        first, last = 0, layout.keyframe_count
+    else:
+        first, last = find_record_range(stream_data, layout, *frame_range)
+
+    if layout.track_type == TrackType.QUATERNION:
+        return decompress_quaternion_keyframes(stream_data, layout, first, last)
+
+    if layout.track_type == TrackType.QUATERNION_1_DOF:
+        return decompress_quaternion_1_dof_keyframes(stream_data, layout, first, last)
+
+    return decompress_vector_keyframes(stream_data, layout, first, last)
 
 
 @dataclasses.dataclass
-class Bone:
-    """Bone."""
+class BoneLayout:
+    """Bone Layout.
 
-    rotation_keyframes: list[QuaternionKeyframe]
-    scale_keyframes: list[int]
-    location_keyframes: list[int]
+    Positive indices point to static data, negative indices to compressed tracks in the stream data and zero means
+    the channel holds its rest value.
+    """
 
+    rotation_index: int
+    scale_index: int
+    location_index: int
+    rotation: TrackLayout | None
+    scale: TrackLayout | None
+    location: TrackLayout | None
 
-def read_bone(
+
+def read_bone_layout(
     file: typing.BinaryIO,
     endianness: str,
     game_type: utils.GameType,
-    static_data: list[float],
     stream_data: bit_array.BitArray,
     fps: float,
-) -> Bone:
-    """Read bone."""
+) -> BoneLayout:
+    """Read bone layout."""
     rotation_index = struct.unpack(endianness + 'i', file.read(4))[0]
     scale_index = struct.unpack(endianness + 'i', file.read(4))[0]
     location_index = struct.unpack(endianness + 'i', file.read(4))[0]
@@ -312,76 +530,112 @@ def read_bone(
         ):
             file.read(20)
 
-    rotation_keyframes = []
-    scale_keyframes = []
-    location_keyframes = []
-
-    if rotation_index > 0:
-        rotation_keyframes = [
-            QuaternionKeyframe(
-                0,
-                1.0,
-                mathutils.Quaternion(
-                    (
-                        static_data[rotation_index + 3],
-                        static_data[rotation_index],
-                        static_data[rotation_index + 1],
-                        static_data[rotation_index + 2],
-                    ),
-                ),
-            ),
-        ]
-    elif rotation_index < 0:
+    rotation = None
+    scale = None
+    location = None
+
+    if rotation_index < 0:
         is_1_dof = False
 
+        track_index = rotation_index
         if game_type in (utils.GameType.THESIMS2PETS, utils.GameType.THESIMS2CASTAWAY, utils.GameType.THESIMS3):
-            is_1_dof = stream_data.get_bit(-rotation_index)
-            rotation_index -= 1
+            is_1_dof = stream_data.get_bit(-track_index)
+            track_index -= 1
 
         if is_1_dof:
-            rotation_keyframes = decompress_quaternion_1_dof_keyframes(stream_data, rotation_index, fps)
+            rotation = read_quaternion_1_dof_track_layout(stream_data, track_index, fps)
         else:
-            rotation_keyframes = decompress_quaternion_keyframes(stream_data, rotation_index, fps, game_type)
+            rotation = read_quaternion_track_layout(stream_data, track_index, fps, game_type)
 
-    else:
-        rotation_keyframes = [QuaternionKeyframe(0, 1.0, mathutils.Quaternion((1.0, 0.0, 0.0, 0.0)))]
-
-    if scale_index > 0:
-        scale_keyframes = [
-            VectorKeyframe(
-                0,
-                1.0,
-                mathutils.Vector(static_data[scale_index : scale_index + 3]),
+    if scale_index < 0:
+        scale = read_vector_track_layout(stream_data, scale_index, fps, game_type)
+
+    if location_index < 0:
+        location = read_vector_track_layout(stream_data, location_index, fps, game_type)
+
+    return BoneLayout(rotation_index, scale_index, location_index, rotation, scale, location)
+
+
+@dataclasses.dataclass(frozen=True)
+class BoneMask:
+    """The tracks of a bone to read."""
+
+    rotation: bool = True
+    scale: bool = True
+    location: bool = True
+
+
+FULL_BONE_MASK = BoneMask()
+
+
+@dataclasses.dataclass(slots=True)
+class Bone:
+    """Bone."""
+
+    rotation: Track
+    scale: Track
+    location: Track
+
+
+def read_bone(
+    bone_layout: BoneLayout,
+    static_data: np.ndarray,
+    stream_data: bit_array.BitArray,
+    frame_range: tuple[int, int] | None = None,
+    mask: BoneMask = FULL_BONE_MASK,
+) -> Bone:
+    """Read bone. Masked tracks are not decoded and have no keyframes."""
+    rotation_index = bone_layout.rotation_index
+    scale_index = bone_layout.scale_index
+    location_index = bone_layout.location_index
+
+    if not mask.rotation:
+        rotation = create_empty_track(4)
+    elif rotation_index > 0:
+        rotation = create_static_track(
+            (
+                static_data[rotation_index + 3],
+                static_data[rotation_index],
+                static_data[rotation_index + 1],
+                static_data[rotation_index + 2],
             ),
-        ]
-    elif scale_index < 0:
-        scale_keyframes = decompress_vector_keyframes(stream_data, scale_index, fps, game_type)
+        )
+    elif bone_layout.rotation is not None:
+        rotation = decompress_keyframes(stream_data, bone_layout.rotation, frame_range)
     else:
-        scale_keyframes = [VectorKeyframe(0, 1.0, mathutils.Vector((1.0, 1.0, 1.0)))]
-
-    if location_index > 0:
-        location_keyframes = [
-            VectorKeyframe(
-                0,
-                1.0,
-                mathutils.Vector(static_data[location_index : location_index + 3]),
-            ),
-        ]
-    elif location_index < 0:
-        location_keyframes = decompress_vector_keyframes(stream_data, location_index, fps, game_type)
+        rotation = create_static_track((1.0, 0.0, 0.0, 0.0))
+
+    if not mask.scale:
+        scale = create_empty_track(3)
+    elif scale_index > 0:
+        scale = create_static_track(static_data[scale_index : scale_index + 3])
+    elif bone_layout.scale is not None:
+        scale = decompress_keyframes(stream_data, bone_layout.scale, frame_range)
+    else:
+        scale = create_static_track((1.0, 1.0, 1.0))
+
+    if not mask.location:
+        location = create_empty_track(3)
+    elif location_index > 0:
+        location = create_static_track(static_data[location_index : location_index + 3])
+    elif bone_layout.location is not None:
+        location = decompress_keyframes(stream_data, bone_layout.location, frame_range)
     else:
-        location_keyframes = [VectorKeyframe(0, 1.0, mathutils.Vector((0.0, 0.0, 0.0)))]
+        location = create_static_track((0.0, 0.0, 0.0))
 
-    return Bone(rotation_keyframes, scale_keyframes, location_keyframes)
+    return Bone(rotation, scale, location)
 
 
 @dataclasses.dataclass
-class Animation:
-    """Animation."""
+class AnimationLayout:
+    """Animation Layout."""
 
     name: str
     frame_count: int
-    bones: list[Bone]
+    bones: list[BoneLayout]
+    static_data: np.ndarray
+    stream_data: bit_array.BitArray
+    fps: float
     intensity: float
     flags: int
     blend_type: int
@@ -393,8 +647,8 @@ class Animation:
     end_action: int
 
 
-def read_animation(file: typing.BinaryIO, endianness: str, game_type: utils.GameType) -> Animation:
-    """Read animation."""
+def read_animation_layout(file: typing.BinaryIO, endianness: str, game_type: utils.GameType) -> AnimationLayout:
+    """Read the animation header and the layout of every bone track without decompressing any keyframes."""
     match game_type:
         case utils.GameType.THEURBZ:
             file.read(20)
@@ -447,15 +701,19 @@ def read_animation(file: typing.BinaryIO, endianness: str, game_type: utils.Game
         file.read(4)
 
     static_float_count = struct.unpack(endianness + 'I', file.read(4))[0]
-    static_data = [struct.unpack(endianness + 'f', file.read(4))[0] for _ in range(static_float_count)]
+    static_data = np.frombuffer(file.read(static_float_count * 4), dtype=np.dtype(endianness + 'f4'))
+    if len(static_data) != static_float_count:
+        raise utils.FileReadError
 
     stream_data_bit_count = struct.unpack(endianness + 'I', file.read(4))[0]
 
     stream_data_length = ((stream_data_bit_count + 0x1F) >> 5) << 2
 
-    stream_data = [struct.unpack(endianness + 'I', file.read(4))[0] for _ in range(int(stream_data_length / 4))]
+    stream_data = file.read(stream_data_length)
+    if len(stream_data) != stream_data_length:
+        raise utils.FileReadError
 
-    stream_data = bit_array.BitArray(stream_data)
+    stream_data = bit_array.BitArray(stream_data, endianness)
 
     fps = struct.unpack(endianness + 'f', file.read(4))[0]
     intensity = struct.unpack(endianness + 'f', file.read(4))[0]
@@ -472,7 +730,7 @@ def read_animation(file: typing.BinaryIO, endianness: str, game_type: utils.Game
 
     file.seek(bone_position)
 
-    bones = [read_bone(file, endianness, game_type, static_data, stream_data, fps) for _ in range(bone_count)]
+    bones = [read_bone_layout(file, endianness, game_type, stream_data, fps) for _ in range(bone_count)]
 
     file.seek(end_position)
 
@@ -491,10 +749,13 @@ def read_animation(file: typing.BinaryIO, endianness: str, game_type: utils.Game
 
     frame_count = frame_count if fps == 60.0 else frame_count * 2
 
-    return Animation(
+    return AnimationLayout(
         name,
         frame_count,
         bones,
+        static_data,
+        stream_data,
+        fps,
         intensity,
         flags,
         blend_type,
@@ -507,16 +768,119 @@ def read_animation(file: typing.BinaryIO, endianness: str, game_type: utils.Game
     )
 
 
-def read_file(file_path: pathlib.Path, game_type: utils.GameType, endianness: str) -> Animation:
-    """Read an animation file."""
+@dataclasses.dataclass
+class Animation:
+    """Animation."""
+
+    name: str
+    frame_count: int
+    bones: list[Bone]
+    intensity: float
+    flags: int
+    blend_type: int
+    blend_m1: float
+    blend_m2: float
+    blend_duration: float
+    blend_speed: float
+    rotation_accumulator: int
+    end_action: int
+
+
+def calculate_fingerprint(anim: Animation, bone_masks: typing.Sequence[BoneMask] = ()) -> str:
+    """Calculate a hash of the keyframes of the unmasked tracks, which is equal for animations with the same motion."""
+    fingerprint = hashlib.blake2b(digest_size=16)
+    fingerprint.update(struct.pack('<II', anim.frame_count, len(anim.bones)))
+
+    for i, bone in enumerate(anim.bones):
+        mask = bone_masks[i] if i < len(bone_masks) else FULL_BONE_MASK
+        for track, is_included in (
+            (bone.rotation, mask.rotation),
+            (bone.scale, mask.scale),
+            (bone.location, mask.location),
+        ):
+            if not is_included:
+                fingerprint.update(b'\xff\xff\xff\xff')
+                continue
+
+            fingerprint.update(struct.pack('<I', len(track)))
+            fingerprint.update(np.ascontiguousarray(track.frames, dtype='<i4').tobytes())
+            fingerprint.update(np.ascontiguousarray(track.values, dtype='<f4').tobytes())
+
+    return fingerprint.hexdigest()
+
+
+def decompress_animation(
+    layout: AnimationLayout,
+    frame_range: tuple[int, int] | None = None,
+    bone_masks: typing.Sequence[BoneMask] = (),
+) -> Animation:
+    """Decompress the keyframes of an animation layout, optionally only those covering a frame range.
+
+    Bones without a mask are read in full.
+    """
+    bones = [
+        read_bone(
+            bone,
+            layout.static_data,
+            layout.stream_data,
+            frame_range,
+            bone_masks[i] if i < len(bone_masks) else FULL_BONE_MASK,
+        )
+        for i, bone in enumerate(layout.bones)
+    ]
+
+    return Animation(
+        layout.name,
+        layout.frame_count,
+        bones,
+        layout.intensity,
+        layout.flags,
+        layout.blend_type,
+        layout.blend_m1,
+        layout.blend_m2,
+        layout.blend_duration,
+        layout.blend_speed,
+        layout.rotation_accumulator,
+        layout.end_action,
+    )
+
+
+def read_animation(
+    file: typing.BinaryIO,
+    endianness: str,
+    game_type: utils.GameType,
+    frame_range: tuple[int, int] | None = None,
+    bone_masks: typing.Sequence[BoneMask] = (),
+) -> Animation:
+    """Read animation."""
+    return decompress_animation(read_animation_layout(file, endianness, game_type), frame_range, bone_masks)
+
+
+def read_layout_file(file_path: pathlib.Path, game_type: utils.GameType, endianness: str) -> AnimationLayout:
+    """Read the layout of an animation file."""
     try:
         with file_path.open(mode='rb') as file:
-            animation = read_animation(file, endianness, game_type)
+            layout = read_animation_layout(file, endianness, game_type)
 
             if len(file.read(1)) != 0:
                 raise utils.FileReadError
 
-            return animation
+            return layout
 
     except (OSError, IndexError, ValueError, ZeroDivisionError, struct.error) as exception:
         raise utils.FileReadError from exception
+
+
+def read_file(
+    file_path: pathlib.Path,
+    game_type: utils.GameType,
+    endianness: str,
+    frame_range: tuple[int, int] | None = None,
+    bone_masks: typing.Sequence[BoneMask] = (),
+) -> Animation:
+    """Read an animation file, optionally only the keyframes covering a frame range and the unmasked tracks."""
+    try:
+        return decompress_animation(read_layout_file(file_path, game_type, endianness), frame_range, bone_masks)
+
+    except (IndexError, ValueError, ZeroDivisionError) as exception:
+        raise utils.FileReadError from exception
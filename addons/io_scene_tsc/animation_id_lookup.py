@@ -1,19 +1,21 @@
 """Get animation IDs from model IDs."""
 
+import collections.abc
 import pathlib
-import struct
 
 
+from . import object_table
 from . import utils
 
 
 def list_animation_ids_from_model_id(
-    main_directory: pathlib.Path,
+    objects_file_path: pathlib.Path | None,
+    objects_file_size: int,
     game_type: utils.GameType,
     endianness: str,
     model_id: int,
 ) -> tuple[bool, list[int]]:
-    """Read animation IDs from a SimsObject file."""
+    """Read animation IDs from a SimsObjects or allobjects file."""
     # bustin' out map
     if game_type == utils.GameType.THESIMSBUSTINOUT and model_id == 0x50AE831:
         return False, [0x92D8AE4A, 0x30AA9779, 0x6BCF6EE9]
@@ -39,67 +41,30 @@ def list_animation_ids_from_model_id(
     ):
         return False, [0x24C58257]
 
-    match game_type:
-        case utils.GameType.THESIMS:
-            start_position = 1792468
-            end_position = 1833523
-            objects_file_path = main_directory / "quickdat" / "SimsObjects"
-        case utils.GameType.THESIMSBUSTINOUT:
-            start_position = 2867964
-            end_position = 2934816
-            objects_file_path = main_directory / "quickdat" / "SimsObjects"
-        case utils.GameType.THEURBZ:
-            start_position = 1566992
-            end_position = 1615672
-            objects_file_path = main_directory / "quickdat" / "SimsObjects"
-        case utils.GameType.THESIMS2:
-            start_position = 982304
-            end_position = 1040972
-            objects_file_path = main_directory / "quickdat" / "SimsObjects"
-        case utils.GameType.THESIMS2PETS:
-            start_position = 1124496
-            end_position = 1197700
-            objects_file_path = main_directory / "quickdat" / "SimsObjects"
-        case utils.GameType.THESIMS2CASTAWAY:
-            start_position = 886652
-            end_position = 946662
-            objects_file_path = main_directory / "quickdat" / "SimsObjects"
-        case utils.GameType.THESIMS3:
-            objects_file_path = main_directory / "binaries" / "allobjects.odf"
-            match objects_file_path.stat().st_size:
-                case 3401865:  # prototype
-                    start_position = 1007283
-                    end_position = 1235971
-                case 2454265:  # retail
-                    start_position = 847931
-                    end_position = 1026640
-
-    try:
-        with objects_file_path.open(mode='rb') as file:
-            file.seek(start_position)
-            data = file.read(end_position - start_position)
-
-            search_position = 0
-
-            animation_ids = []
-
-            found = False
-
-            while True:
-                find_position = data.find(struct.pack(endianness + 'I', model_id), search_position)
-                if find_position != -1:
-                    search_position = find_position + 4
-
-                    found = True
+    if objects_file_path is None:
+        return False, []
 
-                    animation_ids.append(
-                        struct.unpack(endianness + 'I', data[find_position + 8 : find_position + 12])[0]
-                    )
+    table = object_table.get_object_table(objects_file_path, objects_file_size, game_type, endianness)
+    if table is None:
+        return False, []
 
-                else:
-                    break
+    return table.find_animation_ids(model_id)
 
-            return found, animation_ids
 
-    except (OSError, struct.error) as _:
-        return False, []
+def list_model_ids_from_animation_id(
+    objects_file_path: pathlib.Path | None,
+    objects_file_size: int,
+    game_type: utils.GameType,
+    endianness: str,
+    animation_id: int,
+    model_ids: collections.abc.Collection[int],
+) -> list[int]:
+    """Get the IDs of the models that use an animation, out of the IDs of existing models."""
+    if objects_file_path is None:
+        return []
+
+    table = object_table.get_object_table(objects_file_path, objects_file_size, game_type, endianness)
+    if table is None:
+        return []
+
+    return [x for x in table.find_model_ids(animation_id) if x in model_ids]
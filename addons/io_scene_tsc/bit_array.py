@@ -1,20 +1,30 @@
 """Bit Array."""
 
-import ctypes
+import numpy as np
+import struct
+
+
+UINT32_STRUCT = struct.Struct('=I')
+FLOAT32_STRUCT = struct.Struct('=f')
 
 
 class BitArray:
-    """Bit Array."""
+    """Bit Array.
 
-    bits: list[int]
+    The bits are a zero-copy uint32 view of the stream data in its file byte order.
+    """
 
-    def __init__(self, bits: list[int]) -> None:
+    bits: np.ndarray
+    _words: np.ndarray | None
+
+    def __init__(self, data: bytes, endianness: str) -> None:
         """Initialize a BitArray."""
-        self.bits = bits
+        self.bits = np.frombuffer(data, dtype=np.dtype(endianness + 'u4'))
+        self._words = None
 
     def get_bit(self, index: int) -> bool:
         """Get bit as bool."""
-        return (self.bits[index >> 5] & (1 << (index & 0x1F))) != 0
+        return (int(self.bits[index >> 5]) & (1 << (index & 0x1F))) != 0
 
     def get_bits_unsigned(self, index: int, count: int) -> int:
         """Get bits as unsigned int."""
@@ -27,12 +37,12 @@ class BitArray:
         if bit_array_index == bit_array_index_end:
             mask = (1 << (count & 0x1F)) - 1
             if mask == 0:
-                return self.bits[bit_array_index]
-            return (self.bits[bit_array_index] >> bit_offset) & mask
+                return int(self.bits[bit_array_index])
+            return (int(self.bits[bit_array_index]) >> bit_offset) & mask
 
         int_1_mask = (1 << ((index + count) & 0x1F)) - 1
-        int_0 = self.bits[bit_array_index]
-        int_1 = self.bits[bit_array_index_end] & int_1_mask
+        int_0 = int(self.bits[bit_array_index])
+        int_1 = int(self.bits[bit_array_index_end]) & int_1_mask
 
         return (int_1 << (-bit_offset & 0x1F)) | (int_0 >> bit_offset)
 
@@ -54,7 +64,42 @@ class BitArray:
         """Get bits as float."""
         bits = self.get_bits_unsigned(index, 32)
 
-        return ctypes.c_float.from_buffer(ctypes.c_uint32(bits)).value
+        return FLOAT32_STRUCT.unpack(UINT32_STRUCT.pack(bits))[0]
+
+    def get_words(self) -> np.ndarray:
+        """Get the bits as native uint64 words padded with a zero word, so any index can read the next word."""
+        if self._words is None:
+            self._words = np.zeros(len(self.bits) + 1, dtype=np.uint64)
+            self._words[:-1] = self.bits
+
+        return self._words
+
+    def get_bits_unsigned_array(self, indices: np.ndarray, count: int) -> np.ndarray:
+        """Get bits at every index as unsigned ints."""
+        if count == 0:
+            return np.zeros(len(indices), dtype=np.int64)
+
+        words = self.get_words()
+        word_indices = indices >> 5
+
+        bits = words[word_indices] | (words[word_indices + 1] << np.uint64(32))
+        bits >>= (indices & 0x1F).astype(np.uint64)
+        bits &= np.uint64((1 << count) - 1)
+
+        return bits.astype(np.int64)
+
+    def get_bits_signed_array(self, indices: np.ndarray, count: int) -> np.ndarray:
+        """Get bits at every index as signed ints."""
+        bits = self.get_bits_unsigned_array(indices, count)
+
+        if count == 0:
+            return bits
+
+        return bits - (((bits >> (count - 1)) & 1) << count)
+
+    def get_float_array(self, indices: np.ndarray) -> np.ndarray:
+        """Get bits at every index as floats."""
+        return self.get_bits_unsigned_array(indices, 32).astype(np.uint32).view(np.float32).astype(np.float64)
 
     def signed_bits_to_float_scaler(self, bits: int) -> float:
         """Calculate the float scaler from signed bits."""
@@ -0,0 +1,381 @@
+"""SQLite catalog of the models, characters, animations, shaders and textures of an extracted game."""
+
+import collections
+import collections.abc
+import concurrent.futures
+import contextlib
+import dataclasses
+import hashlib
+import logging
+import os
+import pathlib
+import sqlite3
+import typing
+
+
+from . import animation
+from . import animation_id_lookup
+from . import character
+from . import character_id_lookup
+from . import disk_cache
+from . import game_root
+from . import model
+from . import shader
+from . import texture_info
+from . import utils
+
+
+CATALOG_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE models (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    game INTEGER NOT NULL,
+    endianness TEXT NOT NULL,
+    sub_model_count INTEGER NOT NULL,
+    mesh_count INTEGER NOT NULL,
+    vertex_count INTEGER NOT NULL,
+    character_id INTEGER NOT NULL,
+    is_object INTEGER NOT NULL
+);
+CREATE TABLE meshes (
+    model_id INTEGER NOT NULL,
+    sub_model_index INTEGER NOT NULL,
+    mesh_index INTEGER NOT NULL,
+    vertex_count INTEGER NOT NULL,
+    shader_id INTEGER NOT NULL
+);
+CREATE TABLE model_animations (
+    model_id INTEGER NOT NULL,
+    animation_id INTEGER NOT NULL
+);
+CREATE TABLE characters (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    bone_count INTEGER NOT NULL
+);
+CREATE TABLE animations (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    frame_count INTEGER NOT NULL,
+    bone_count INTEGER NOT NULL
+);
+CREATE TABLE shaders (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    texture_id INTEGER,
+    target_shader_id INTEGER
+);
+CREATE TABLE textures (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    depth INTEGER,
+    has_alpha INTEGER
+);
+CREATE INDEX models_name ON models (name);
+CREATE INDEX models_character_id ON models (character_id);
+CREATE INDEX meshes_model_id ON meshes (model_id);
+CREATE INDEX meshes_shader_id ON meshes (shader_id);
+CREATE INDEX model_animations_model_id ON model_animations (model_id);
+CREATE INDEX model_animations_animation_id ON model_animations (animation_id);
+CREATE INDEX shaders_texture_id ON shaders (texture_id);
+CREATE INDEX shaders_target_shader_id ON shaders (target_shader_id);
+"""
+
+
+def get_catalog_file_path(root: pathlib.Path) -> pathlib.Path:
+    """Get the catalog file path of a game root."""
+    root_hash = hashlib.blake2b(str(root.resolve()).encode(), digest_size=8).hexdigest()
+    return disk_cache.get_cache_directory() / f"catalog_{root_hash}.sqlite"
+
+
+@dataclasses.dataclass
+class ModelRecord:
+    """Catalog record of a model and its meshes."""
+
+    name: str
+    game: utils.GameType
+    endianness: str
+    sub_model_count: int
+    meshes: list[tuple[int, int, int, int]]
+
+
+def read_model_record(file_path: pathlib.Path) -> ModelRecord | None:
+    """Read the catalog record of a model file from its header and mesh counts, or None if it is not a model."""
+    try:
+        model_summary = model.read_summary_file(file_path)
+    except utils.FileReadError as _:
+        return None
+
+    meshes = []
+    for sub_model_index, sub_model in enumerate(model_summary.sub_models):
+        for mesh_index, mesh in enumerate(sub_model.meshes):
+            vertex_count = mesh.index_count if sub_model.has_main_mesh else mesh.position_count
+            meshes.append((sub_model_index, mesh_index, vertex_count, mesh.shader_id))
+
+    return ModelRecord(
+        model_summary.name,
+        model_summary.game,
+        model_summary.endianness,
+        len(model_summary.sub_models),
+        meshes,
+    )
+
+
+def read_character_record(
+    file_path: pathlib.Path,
+    game_type: utils.GameType,
+    endianness: str,
+) -> tuple[str, int] | None:
+    """Read the name and bone count of a character file."""
+    try:
+        char_desc = character.read_file(file_path, game_type, endianness)
+    except utils.FileReadError as _:
+        return None
+
+    return char_desc.name, len(char_desc.bones)
+
+
+def read_animation_record(
+    file_path: pathlib.Path,
+    game_type: utils.GameType,
+    endianness: str,
+) -> tuple[str, int, int] | None:
+    """Read the name, frame count and bone count of an animation file without decompressing any keyframes."""
+    try:
+        layout = animation.read_layout_file(file_path, game_type, endianness)
+    except utils.FileReadError as _:
+        return None
+
+    return layout.name, layout.frame_count, len(layout.bones)
+
+
+def read_shader_record(
+    file_path: pathlib.Path,
+    game_type: utils.GameType,
+    endianness: str,
+) -> tuple[str, int | None, int | None] | None:
+    """Read the name and texture ID of a shader, or the ID of the shader a shader IDs file points to."""
+    try:
+        shader_desc = shader.read_file(file_path, game_type, endianness)
+    except utils.FileReadError as _:
+        return None
+
+    if type(shader_desc) is shader.ShaderIDs:
+        return file_path.stem, None, shader_desc.ids[-1] if shader_desc.ids else None
+
+    if shader_desc is None:
+        return None
+
+    texture_id = shader_desc.render_passes[0].texture_id if shader_desc.render_passes else None
+
+    return shader_desc.name, texture_id, None
+
+
+def read_records(
+    executor: concurrent.futures.Executor,
+    read_function: collections.abc.Callable,
+    file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+    *args: object,
+) -> list[tuple[int, pathlib.Path, typing.Any]]:
+    """Read the records of every file of an ID map in parallel, skipping the files that cannot be read."""
+    items = list(file_path_id_map.items())
+    records = executor.map(read_function, [x[1] for x in items], *[[x] * len(items) for x in args])
+
+    return [(x, file_path, record) for (x, file_path), record in zip(items, records) if record is not None]
+
+
+def write_catalog(file_path: pathlib.Path, rows: dict[str, list[tuple]]) -> None:
+    """Write the rows of every table to a new catalog database, replacing the previous one at once."""
+    temporary_file_path = file_path.with_name(file_path.name + ".tmp")
+    temporary_file_path.unlink(missing_ok=True)
+
+    with contextlib.closing(sqlite3.connect(temporary_file_path)) as connection:
+        connection.executescript(SCHEMA)
+        connection.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+
+        for table_name, table_rows in rows.items():
+            if table_rows:
+                placeholders = ", ".join("?" * len(table_rows[0]))
+                connection.executemany(f"INSERT OR REPLACE INTO {table_name} VALUES ({placeholders})", table_rows)  # noqa: S608
+
+        connection.commit()
+
+    temporary_file_path.replace(file_path)
+
+
+def build_catalog(logger: logging.Logger, root: pathlib.Path) -> pathlib.Path:
+    """Parse every file of a game root in parallel and write its catalog database."""
+    game_root_index = game_root.get_game_root_index(root)
+
+    rows: dict[str, list[tuple]] = {
+        "models": [],
+        "meshes": [],
+        "model_animations": [],
+        "characters": [],
+        "animations": [],
+        "shaders": [],
+        "textures": [],
+    }
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        model_records = read_records(executor, read_model_record, game_root_index.models)
+
+        # the other files do not identify their game, so they are read as the game of most of the models
+        game_types = collections.Counter((x[2].game, x[2].endianness) for x in model_records)
+        if game_types:
+            (game_type, endianness), _ = game_types.most_common(1)[0]
+
+            for character_id, file_path, (name, bone_count) in read_records(
+                executor,
+                read_character_record,
+                game_root_index.characters,
+                game_type,
+                endianness,
+            ):
+                rows["characters"].append((character_id, name, str(file_path), bone_count))
+
+            for animation_id, file_path, (name, frame_count, bone_count) in read_records(
+                executor,
+                read_animation_record,
+                game_root_index.animations,
+                game_type,
+                endianness,
+            ):
+                rows["animations"].append((animation_id, name, str(file_path), frame_count, bone_count))
+
+            for shader_id, file_path, (name, texture_id, target_shader_id) in read_records(
+                executor,
+                read_shader_record,
+                game_root_index.shaders,
+                game_type,
+                endianness,
+            ):
+                rows["shaders"].append((shader_id, name, str(file_path), texture_id, target_shader_id))
+        elif game_root_index.models:
+            logger.info(f"Could not read any models in {root}")  # noqa: G004
+
+        texture_items = list(game_root_index.textures.items())
+        for (texture_id, file_path), texture in zip(
+            texture_items,
+            executor.map(texture_info.get_texture_info, [x[1] for x in texture_items]),
+        ):
+            texture_fields = dataclasses.astuple(texture) if texture is not None else (None, None, None, None)
+            rows["textures"].append((texture_id, file_path.stem, str(file_path), *texture_fields))
+
+    texture_info.save_texture_info_table()
+
+    for model_id, file_path, record in model_records:
+        is_object, animation_ids = animation_id_lookup.list_animation_ids_from_model_id(
+            game_root_index.object_table_path,
+            game_root_index.object_table_size,
+            record.game,
+            record.endianness,
+            model_id,
+        )
+
+        rows["models"].append(
+            (
+                model_id,
+                record.name,
+                str(file_path),
+                record.game.value,
+                record.endianness,
+                record.sub_model_count,
+                len(record.meshes),
+                sum(x[2] for x in record.meshes),
+                character_id_lookup.get_character_id_from_model(record.name, model_id, record.game),
+                is_object,
+            ),
+        )
+        rows["meshes"] += [(model_id, *x) for x in record.meshes]
+        rows["model_animations"] += [(model_id, x) for x in animation_ids]
+
+    catalog_file_path = get_catalog_file_path(root)
+    write_catalog(catalog_file_path, rows)
+
+    return catalog_file_path
+
+
+def open_catalog(root: pathlib.Path) -> sqlite3.Connection | None:
+    """Open the catalog of a game root read only, or get None if it has not been built with this version."""
+    catalog_file_path = get_catalog_file_path(root)
+    if not catalog_file_path.is_file():
+        return None
+
+    try:
+        connection = sqlite3.connect(f"{catalog_file_path.as_uri()}?mode=ro", uri=True)
+        if connection.execute("PRAGMA user_version").fetchone()[0] == CATALOG_VERSION:
+            return connection
+        connection.close()
+    except sqlite3.Error as _:
+        return None
+
+    return None
+
+
+def search_models(connection: sqlite3.Connection, pattern: str) -> list[pathlib.Path]:
+    """Get the file paths of the models with names matching a pattern with * and ? wildcards."""
+    rows = connection.execute("SELECT path FROM models WHERE name GLOB ? ORDER BY name", (pattern,))
+    return [pathlib.Path(x[0]) for x in rows]
+
+
+def list_models_using_animations(connection: sqlite3.Connection, pattern: str) -> list[pathlib.Path]:
+    """Get the file paths of the models whose objects use animations with names matching a pattern."""
+    rows = connection.execute(
+        "SELECT DISTINCT models.path FROM animations "
+        "JOIN model_animations ON model_animations.animation_id = animations.id "
+        "JOIN models ON models.id = model_animations.model_id "
+        "WHERE animations.name GLOB ? ORDER BY models.name",
+        (pattern,),
+    )
+    return [pathlib.Path(x[0]) for x in rows]
+
+
+def list_models_using_characters(connection: sqlite3.Connection, pattern: str) -> list[pathlib.Path]:
+    """Get the file paths of the models that use characters with names matching a pattern."""
+    rows = connection.execute(
+        "SELECT models.path FROM characters "
+        "JOIN models ON models.character_id = characters.id "
+        "WHERE characters.name GLOB ? ORDER BY models.name",
+        (pattern,),
+    )
+    return [pathlib.Path(x[0]) for x in rows]
+
+
+def list_models_using_textures(connection: sqlite3.Connection, pattern: str) -> list[pathlib.Path]:
+    """Get the file paths of the models with meshes that use textures with names matching a pattern.
+
+    Textures are used directly or through shader IDs files.
+    """
+    rows = connection.execute(
+        "SELECT DISTINCT models.path FROM textures "
+        "JOIN shaders AS texture_shaders ON texture_shaders.texture_id = textures.id "
+        "LEFT JOIN shaders AS id_shaders ON id_shaders.target_shader_id = texture_shaders.id "
+        "JOIN meshes ON meshes.shader_id IN (texture_shaders.id, id_shaders.id) "
+        "JOIN models ON models.id = meshes.model_id "
+        "WHERE textures.name GLOB ? ORDER BY models.name",
+        (pattern,),
+    )
+    return [pathlib.Path(x[0]) for x in rows]
+
+
+def find_models(connection: sqlite3.Connection, search_by: str, pattern: str) -> list[pathlib.Path]:
+    """Get the file paths of the models found by their own name or the names of the assets they use."""
+    match search_by:
+        case 'ANIMATION':
+            return list_models_using_animations(connection, pattern)
+        case 'CHARACTER':
+            return list_models_using_characters(connection, pattern)
+        case 'TEXTURE':
+            return list_models_using_textures(connection, pattern)
+
+    return search_models(connection, pattern)
@@ -0,0 +1,67 @@
+"""Persistent cache files in the Blender user data directory."""
+
+import bpy
+import json
+import numpy as np
+import pathlib
+import zipfile
+
+
+CACHE_VERSION = 1
+
+
+def get_cache_directory() -> pathlib.Path:
+    """Get the directory of the cache files, creating it if needed."""
+    return pathlib.Path(bpy.utils.user_resource('DATAFILES', path="io_scene_tsc", create=True))
+
+
+def read_json(file_name: str) -> dict:
+    """Read a JSON cache file, or an empty cache if it is missing, corrupt or from another cache version."""
+    try:
+        with (get_cache_directory() / file_name).open(encoding='utf-8') as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION or not isinstance(cache.get("data"), dict):
+        return {}
+
+    return cache["data"]
+
+
+def write_json(file_name: str, data: dict) -> None:
+    """Write a JSON cache file, replacing the previous one at once so readers never see a partial file."""
+    file_path = get_cache_directory() / file_name
+    temporary_file_path = file_path.with_name(file_path.name + ".tmp")
+
+    try:
+        with temporary_file_path.open(mode='w', encoding='utf-8') as file:
+            json.dump({"version": CACHE_VERSION, "data": data}, file, separators=(',', ':'))
+        temporary_file_path.replace(file_path)
+    except OSError:
+        return
+
+
+def read_arrays(file_name: str) -> dict[str, np.ndarray]:
+    """Read a NumPy cache file, or an empty cache if it is missing, corrupt or from another cache version."""
+    try:
+        with np.load(get_cache_directory() / file_name, allow_pickle=False) as arrays:
+            if "version" not in arrays.files or int(arrays["version"]) != CACHE_VERSION:
+                return {}
+
+            return {x: arrays[x] for x in arrays.files if x != "version"}
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return {}
+
+
+def write_arrays(file_name: str, arrays: dict[str, np.ndarray]) -> None:
+    """Write a NumPy cache file, replacing the previous one at once so readers never see a partial file."""
+    file_path = get_cache_directory() / file_name
+    temporary_file_path = file_path.with_name(file_path.name + ".tmp")
+
+    try:
+        with temporary_file_path.open(mode='wb') as file:
+            np.savez(file, version=np.array(CACHE_VERSION), **arrays)
+        temporary_file_path.replace(file_path)
+    except OSError:
+        return
@@ -0,0 +1,151 @@
+"""Index of the files of a game root directory, shared by every import in a session."""
+
+import hashlib
+import os
+import pathlib
+import threading
+
+
+from . import disk_cache
+from . import id_file_path_map
+
+
+# ID directories and whether their IDs are checksums of the file names with extension
+ID_DIRECTORIES = {
+    "models": False,
+    "characters": True,
+    "animations": True,
+    "shaders": True,
+    "textures": False,
+}
+
+
+def is_with_extension(relative_path: str) -> bool:
+    """Check whether the IDs of a directory below the game root are checksums of the file names with extension."""
+    return ID_DIRECTORIES.get(relative_path.split(os.sep, 1)[0], True)
+
+
+def get_index_file_name(root: pathlib.Path) -> str:
+    """Get the cache file name of the index of a game root."""
+    return f"game_root_{hashlib.blake2b(str(root).encode(), digest_size=8).hexdigest()}.json"
+
+
+class GameRootIndex:
+    """Index of the files of a game root directory.
+
+    The maps are read-only and replaced as a whole on refresh, so they can be shared between threads.
+    """
+
+    root: pathlib.Path
+    object_table_path: pathlib.Path | None
+    object_table_size: int
+    models: id_file_path_map.IDFilePathIndex
+    characters: id_file_path_map.IDFilePathIndex
+    animations: id_file_path_map.IDFilePathIndex
+    shaders: id_file_path_map.IDFilePathIndex
+    textures: id_file_path_map.IDFilePathIndex
+    shader_table_signature: tuple[id_file_path_map.IDFilePathIndex, str] | None
+    _records: dict[str, dict] | None
+    _lock: threading.Lock
+
+    def __init__(self, root: pathlib.Path) -> None:
+        """Initialize GameRootIndex."""
+        self.root = root
+        self.object_table_path = None
+        self.object_table_size = 0
+        self.shader_table_signature = None
+        self._records = None
+        self._lock = threading.Lock()
+        self.create_maps()
+
+    def find_object_table(self) -> None:
+        """Find the object table of the game root and its size.
+
+        The game type is not known from the layout, as the quickdat games share it, and is read from the model headers.
+        """
+        self.object_table_path = None
+        self.object_table_size = 0
+
+        # the sims 3 keeps its objects in binaries, the earlier games share the quickdat layout
+        for object_table_path in (
+            self.root / "binaries" / "allobjects.odf",
+            self.root / "quickdat" / "SimsObjects",
+        ):
+            try:
+                self.object_table_size = object_table_path.stat().st_size
+            except OSError:
+                continue
+
+            self.object_table_path = object_table_path
+            return
+
+    def create_maps(self) -> None:
+        """Create the maps of every ID directory from the records."""
+        records = self._records or {}
+
+        maps = {}
+        for directory_name in ID_DIRECTORIES:
+            prefix = directory_name + os.sep
+            relative_paths = [x for x in records if x == directory_name or x.startswith(prefix)]
+            maps[directory_name] = id_file_path_map.IDFilePathIndex(self.root, records, relative_paths)
+
+        self.models = maps["models"]
+        self.characters = maps["characters"]
+        self.animations = maps["animations"]
+        self.shaders = maps["shaders"]
+        self.textures = maps["textures"]
+
+    def refresh(self) -> None:
+        """Walk the ID directories the first time and afterwards rescan the directories that changed."""
+        with self._lock:
+            self.find_object_table()
+
+            index_file_name = get_index_file_name(self.root)
+
+            if self._records is None:
+                self._records = disk_cache.read_json(index_file_name)
+                if not id_file_path_map.is_index_valid(self._records):
+                    self._records = {}
+                is_changed = True
+            else:
+                is_changed = False
+
+            records = self._records
+
+            is_index_changed = id_file_path_map.refresh_index(self.root, records, is_with_extension)
+
+            new_directory_names = [x for x in ID_DIRECTORIES if x not in records and (self.root / x).is_dir()]
+            if new_directory_names:
+                new_records = id_file_path_map.walk_directories(
+                    self.root,
+                    new_directory_names,
+                    set(records),
+                    is_with_extension,
+                )
+                records.update((x, record) for x, record in new_records.items() if record is not None)
+                is_index_changed = True
+
+            if is_index_changed:
+                disk_cache.write_json(index_file_name, records)
+
+            if is_changed or is_index_changed:
+                self.create_maps()
+
+
+GAME_ROOT_INDEXES: dict[pathlib.Path, GameRootIndex] = {}
+GAME_ROOT_INDEXES_LOCK = threading.Lock()
+
+
+def get_game_root_index(root: pathlib.Path) -> GameRootIndex:
+    """Get the session index of a game root, refreshed with the changes since it was last used."""
+    root = root.resolve()
+
+    with GAME_ROOT_INDEXES_LOCK:
+        game_root_index = GAME_ROOT_INDEXES.get(root)
+        if game_root_index is None:
+            game_root_index = GameRootIndex(root)
+            GAME_ROOT_INDEXES[root] = game_root_index
+
+    game_root_index.refresh()
+
+    return game_root_index
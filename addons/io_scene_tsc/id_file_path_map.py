@@ -1,67 +1,187 @@
-"""Lazy loading ID to file path maps."""
+"""ID to file path maps of directory trees."""
 
+import collections.abc
+import concurrent.futures
+import os
 import pathlib
 
 from . import checksum
 
 
-def create_id_file_path_map(directory: pathlib.Path, *, with_extension: bool) -> dict[int, pathlib.Path]:
-    """Create a map between checksum IDs and file paths."""
-    if directory.is_dir():
-        file_dict = {}
-        for file_path in directory.rglob("*"):
-            if with_extension:
-                file_dict[checksum.calculate(file_path.name)] = file_path
-            else:
-                file_dict[checksum.calculate(file_path.stem)] = file_path
-        return file_dict
-    return {}
+WALK_THREAD_COUNT = 8
+
+
+def read_directory_state(directory: pathlib.Path) -> list[int]:
+    """Get the modification time and entry count of a directory, which change when entries are added or removed."""
+    with os.scandir(directory) as entries:
+        return [directory.stat().st_mtime_ns, sum(1 for _ in entries)]
+
+
+def scan_directory(directory: pathlib.Path, *, with_extension: bool) -> dict | None:
+    """Create the record of the state, subdirectories and files of a directory, or None if it does not exist."""
+    entry_count = 0
+    directory_names = []
+    file_names = []
+
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                entry_count += 1
+                if entry.is_dir(follow_symlinks=False):
+                    directory_names.append(entry.name)
+                elif entry.is_file():
+                    file_names.append(entry.name)
+
+        modification_time = directory.stat().st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    file_names.sort()
+    names = file_names if with_extension else [pathlib.PurePath(x).stem for x in file_names]
+
+    return {
+        "state": [modification_time, entry_count],
+        "directories": directory_names,
+        "files": file_names,
+        "ids": checksum.calculate_many(names),
+    }
+
+
+def join_relative_path(relative_directory_path: str, name: str) -> str:
+    """Join a name to a path relative to the indexed directory."""
+    return name if relative_directory_path == "." else relative_directory_path + os.sep + name
+
+
+def walk_directories(
+    directory: pathlib.Path,
+    relative_paths: list[str],
+    known_relative_paths: set[str],
+    is_with_extension: collections.abc.Callable[[str], bool],
+) -> dict[str, dict | None]:
+    """Scan directories and every subdirectory below them that is not known yet.
+
+    Every directory is scanned as a separate task, so subtrees are walked concurrently.
+    """
+    records = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=WALK_THREAD_COUNT) as executor:
+        pending = {
+            executor.submit(scan_directory, directory / x, with_extension=is_with_extension(x)): x
+            for x in relative_paths
+        }
+
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in done:
+                relative_path = pending.pop(future)
+                record = future.result()
+                records[relative_path] = record
+
+                if record is None:
+                    continue
+
+                for directory_name in record["directories"]:
+                    child_relative_path = join_relative_path(relative_path, directory_name)
+                    if child_relative_path not in known_relative_paths:
+                        child_future = executor.submit(
+                            scan_directory,
+                            directory / child_relative_path,
+                            with_extension=is_with_extension(child_relative_path),
+                        )
+                        pending[child_future] = child_relative_path
+
+    return records
+
 
+def remove_directory_records(records: dict[str, dict], relative_path: str) -> None:
+    """Remove the records of a directory and every directory below it."""
+    prefix = relative_path + os.sep
+    for x in [x for x in records if x == relative_path or x.startswith(prefix)]:
+        del records[x]
 
-class IDFilePathMap:
-    """Lazy loading ID to file path map."""
+
+def refresh_index(
+    directory: pathlib.Path,
+    records: dict[str, dict],
+    is_with_extension: collections.abc.Callable[[str], bool],
+) -> bool:
+    """Rescan the directories of an index that changed and the new directories below them.
+
+    Returns whether anything changed.
+    """
+    changed_relative_paths = []
+    for relative_path, record in records.items():
+        try:
+            state = read_directory_state(directory / relative_path)
+        except OSError:
+            state = None
+
+        if state != record["state"]:
+            changed_relative_paths.append(relative_path)
+
+    if not changed_relative_paths:
+        return False
+
+    new_records = walk_directories(directory, changed_relative_paths, set(records), is_with_extension)
+
+    for relative_path in changed_relative_paths:
+        if relative_path not in records:
+            continue
+
+        new_record = new_records[relative_path]
+        if new_record is None:
+            remove_directory_records(records, relative_path)
+            continue
+
+        removed_directory_names = set(records[relative_path]["directories"]) - set(new_record["directories"])
+        for directory_name in removed_directory_names:
+            remove_directory_records(records, join_relative_path(relative_path, directory_name))
+
+    records.update((x, record) for x, record in new_records.items() if record is not None)
+
+    return True
+
+
+def is_index_valid(records: object) -> bool:
+    """Check whether a cached index has the expected layout."""
+    return isinstance(records, dict) and all(
+        isinstance(x, dict) and {"state", "directories", "files", "ids"} <= x.keys() for x in records.values()
+    )
+
+
+class IDFilePathIndex(collections.abc.Mapping):
+    """Map between checksum IDs and file paths, which only creates the paths that are looked up."""
 
     _directory: pathlib.Path
-    _map: dict[int, pathlib.Path] | None
-    _with_extension: bool
-
-    def __init__(
-        self,
-        directory: pathlib.Path,
-        *,
-        with_extension: bool,
-    ) -> None:
-        """Initialize IDFilePathMap."""
+    _paths: dict[int, str]
+
+    def __init__(self, directory: pathlib.Path, records: dict[str, dict], relative_paths: list[str]) -> None:
+        """Initialize IDFilePathIndex from the records of a subset of the directories."""
         self._directory = directory
-        self._map = None
-        self._with_extension = with_extension
-
-    def get(self) -> dict[int, pathlib.Path]:
-        """Get the map."""
-        if self._map:
-            return self._map
-
-        self._map = create_id_file_path_map(self._directory, with_extension=self._with_extension)
-        return self._map
-
-
-class IDFilePathMaps:
-    """Lazy Loading ID to file path maps."""
-
-    characters: IDFilePathMap
-    animations: IDFilePathMap
-    shaders: IDFilePathMap
-    textures: IDFilePathMap
-
-    def __init__(
-        self,
-        characters: pathlib.Path,
-        animations: pathlib.Path,
-        shaders: pathlib.Path,
-        textures: pathlib.Path,
-    ) -> None:
-        """Initialize IDFilePathMaps."""
-        self.characters = IDFilePathMap(characters, with_extension=True)
-        self.animations = IDFilePathMap(animations, with_extension=True)
-        self.shaders = IDFilePathMap(shaders, with_extension=True)
-        self.textures = IDFilePathMap(textures, with_extension=False)
+        self._paths = {}
+
+        # sorted so the file chosen for duplicate IDs does not depend on the walk order
+        for relative_path in sorted(relative_paths):
+            record = records[relative_path]
+            if relative_path == ".":
+                self._paths.update(zip(record["ids"], record["files"]))
+            else:
+                prefix = relative_path + os.sep
+                self._paths.update(zip(record["ids"], [prefix + x for x in record["files"]]))
+
+    def __getitem__(self, key: int) -> pathlib.Path:
+        """Get the file path of an ID."""
+        return self._directory / self._paths[key]
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether there is a file path for an ID."""
+        return key in self._paths
+
+    def __iter__(self) -> collections.abc.Iterator[int]:
+        """Iterate over the IDs."""
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        """Get the number of IDs."""
+        return len(self._paths)
@@ -2,146 +2,691 @@
 
 import bpy
 import bpy_extras.anim_utils
+import concurrent.futures
+import dataclasses
+import fnmatch
+import hashlib
 import itertools
 import logging
-import mathutils
+import math
+import numpy as np
+import os
 import pathlib
 
 
 from . import animation
+from . import disk_cache
+from . import keyframe_reduction
+from . import pose_evaluator
 from . import utils
 
 
-def create_fcurve_data(anim_data: bpy.types.AnimData, data_path: str, index: int, data: list[float]) -> None:
-    """Create the fcurve data for all frames at once."""
+@dataclasses.dataclass
+class RestPose:
+    """Rest pose of an armature, used to convert animation keyframes to pose space."""
+
+    rotations: np.ndarray
+    inverse_rotations: np.ndarray
+    inverse_rotation_matrices: np.ndarray
+    scale_matrix: np.ndarray
+    scale_determinant: float
+    data_paths: list[tuple[str, str, str]]
+    key: str
+
+
+REST_POSE_CACHE: dict[int, RestPose] = {}
+
+
+def create_rest_pose(armature_object: bpy.types.Object) -> RestPose:
+    """Create the rest pose of an armature."""
+    rotations = []
+    inverse_rotations = []
+    inverse_rotation_matrices = []
+    data_paths = []
+
+    key_hash = hashlib.blake2b(digest_size=16)
+
+    for pose_bone in armature_object.pose.bones:
+        key_hash.update(pose_bone.name.encode('utf-8') + b'\0')
+        key_hash.update(pose_bone.parent.name.encode('utf-8') if pose_bone.parent is not None else b'')
+        key_hash.update(b'\0')
+
+        bone_rotation = pose_bone.bone.matrix_local.to_quaternion()
+        bone_rotation_inverted = bone_rotation.inverted()
+
+        rotations.append(bone_rotation)
+        inverse_rotations.append(bone_rotation_inverted)
+        inverse_rotation_matrices.append(bone_rotation_inverted.to_matrix())
+        data_paths.append(
+            (
+                pose_bone.path_from_id("rotation_quaternion"),
+                pose_bone.path_from_id("scale"),
+                pose_bone.path_from_id("location"),
+            ),
+        )
+
+    # the scale of a scale matrix rotated by the bone rotation offset is the length of each of its columns
+    bone_rotation_offset = utils.BONE_ROTATION_OFFSET.to_3x3()
+
+    rotations = np.array(rotations, dtype=np.float64).reshape(-1, 4)
+
+    # armatures with the same bones and bone rotations share converted keyframes and actions
+    key_hash.update(rotations.astype(np.float32).tobytes())
+
+    return RestPose(
+        rotations,
+        np.array(inverse_rotations, dtype=np.float64).reshape(-1, 4),
+        np.array(inverse_rotation_matrices, dtype=np.float64).reshape(-1, 3, 3),
+        np.square(np.array(bone_rotation_offset, dtype=np.float64)),
+        bone_rotation_offset.determinant(),
+        data_paths,
+        key_hash.hexdigest(),
+    )
+
+
+def get_rest_pose(armature_object: bpy.types.Object) -> RestPose:
+    """Get the rest pose of an armature, creating it once per armature datablock."""
+    key = armature_object.data.session_uid
+
+    rest_pose = REST_POSE_CACHE.get(key)
+    if rest_pose is None:
+        rest_pose = create_rest_pose(armature_object)
+        REST_POSE_CACHE[key] = rest_pose
+
+    return rest_pose
+
+
+def clear_rest_pose_cache() -> None:
+    """Clear the cached rest poses, so edited armatures are picked up."""
+    REST_POSE_CACHE.clear()
+
+
+def convert_rotations(rest_pose: RestPose, bone_index: int, rotations: np.ndarray) -> np.ndarray:
+    """Convert rotation keyframes to the pose space of a bone."""
+    rotations = pose_evaluator.multiply_quaternions(
+        pose_evaluator.multiply_quaternions(rest_pose.inverse_rotations[bone_index], rotations),
+        rest_pose.rotations[bone_index],
+    )
+
+    return animation.normalize_quaternions(rotations)
+
+
+def convert_scales(rest_pose: RestPose, scales: np.ndarray) -> np.ndarray:
+    """Convert scale keyframes to the pose space of a bone."""
+    lengths = np.sqrt(np.square(scales) @ rest_pose.scale_matrix)
+
+    # matching Matrix.to_scale, all axes are negated when the scale matrix has a negative determinant
+    is_negative = (np.prod(scales, axis=1) * rest_pose.scale_determinant) < 0.0
+
+    return np.where(is_negative[:, np.newaxis], -lengths, lengths)
+
+
+def convert_locations(rest_pose: RestPose, bone_index: int, locations: np.ndarray) -> np.ndarray:
+    """Convert location keyframes to the pose space of a bone."""
+    return locations @ rest_pose.inverse_rotation_matrices[bone_index].T
+
+
+@dataclasses.dataclass(frozen=True)
+class AnimationOptions:
+    """Animation import options."""
+
+    reduce_keyframes: bool = False
+    rotation_tolerance: float = math.radians(0.1)
+    location_tolerance: float = 0.0001
+    scale_tolerance: float = 0.0001
+    skip_rest_pose_channels: bool = False
+    action_library: bool = False
+    bone_include: tuple[str, ...] = ()
+    bone_exclude: tuple[str, ...] = ()
+    import_rotation: bool = True
+    import_scale: bool = True
+    import_location: bool = True
+    frame_range: tuple[int, int] | None = None
+
+
+def get_animation_frame_range(options: AnimationOptions) -> tuple[int, int] | None:
+    """Get the frame range option in animation frames, which start at 0 instead of 1."""
+    if options.frame_range is None:
+        return None
+
+    frame_start, frame_end = options.frame_range
+    return frame_start - 1, frame_end - 1
+
+
+def parse_bone_patterns(text: str) -> tuple[str, ...]:
+    """Split a comma separated list of bone name patterns."""
+    return tuple(pattern.strip() for pattern in text.split(',') if pattern.strip())
+
+
+def bone_matches(bone: bpy.types.Bone, patterns: tuple[str, ...]) -> bool:
+    """Check whether a bone matches any of the patterns. Patterns starting with > also match every child bone."""
+    for pattern in patterns:
+        if pattern.startswith('>'):
+            subtree_pattern = pattern[1:]
+            if any(
+                fnmatch.fnmatchcase(x.name, subtree_pattern) for x in itertools.chain([bone], bone.parent_recursive)
+            ):
+                return True
+        elif fnmatch.fnmatchcase(bone.name, pattern):
+            return True
+
+    return False
+
+
+def create_bone_masks(armature_object: bpy.types.Object, options: AnimationOptions) -> list[animation.BoneMask]:
+    """Create the masks of the tracks to decode for every bone of an armature."""
+    channel_mask = animation.BoneMask(options.import_rotation, options.import_scale, options.import_location)
+    if not options.bone_include and not options.bone_exclude and channel_mask == animation.FULL_BONE_MASK:
+        return []
+
+    empty_mask = animation.BoneMask(rotation=False, scale=False, location=False)
+
+    bone_masks = []
+    for bone in armature_object.data.bones:
+        is_included = not options.bone_include or bone_matches(bone, options.bone_include)
+        is_excluded = bone_matches(bone, options.bone_exclude)
+        bone_masks.append(channel_mask if is_included and not is_excluded else empty_mask)
+
+    return bone_masks
+
+
+def merge_bone_masks(bone_mask_lists: list[list[animation.BoneMask]]) -> list[animation.BoneMask]:
+    """Merge the bone masks of several armatures into masks that read every track any of them needs."""
+    if any(not bone_masks for bone_masks in bone_mask_lists):
+        return []
+
+    return [
+        animation.BoneMask(
+            any(x.rotation for x in bone_masks),
+            any(x.scale for x in bone_masks),
+            any(x.location for x in bone_masks),
+        )
+        for bone_masks in itertools.zip_longest(*bone_mask_lists, fillvalue=animation.FULL_BONE_MASK)
+    ]
+
+
+@dataclasses.dataclass
+class Channel:
+    """Keyframes of a single fcurve."""
+
+    data_path: str
+    index: int
+    frames: np.ndarray
+    values: np.ndarray
+
+
+def reduce_track(
+    frames: np.ndarray,
+    values: np.ndarray,
+    tolerance: float,
+    rest_value: tuple[float, ...],
+    options: AnimationOptions,
+    *,
+    is_rotation: bool,
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """Reduce the keyframes of a converted track, or return None if the track can be skipped."""
+    if options.skip_rest_pose_channels and keyframe_reduction.is_rest_value(
+        values,
+        rest_value,
+        tolerance,
+        is_rotation=is_rotation,
+    ):
+        return None
+
+    if options.reduce_keyframes:
+        indices = keyframe_reduction.reduce_keyframes(frames, values, tolerance, is_rotation=is_rotation)
+        return frames[indices], values[indices]
+
+    return frames, values
+
+
+def create_channels(
+    rest_pose: RestPose,
+    anim_desc: animation.Animation,
+    options: AnimationOptions,
+    bone_masks: list[animation.BoneMask],
+) -> list[Channel]:
+    """Convert the unmasked tracks of every bone to fcurve channels."""
+    channels = []
+
+    for bone_index, bone in enumerate(anim_desc.bones):
+        rotation_path, scale_path, location_path = rest_pose.data_paths[bone_index]
+        bone_mask = bone_masks[bone_index] if bone_index < len(bone_masks) else animation.FULL_BONE_MASK
+
+        if bone_mask.rotation and len(bone.rotation):
+            track = reduce_track(
+                bone.rotation.frames,
+                convert_rotations(rest_pose, bone_index, bone.rotation.values),
+                options.rotation_tolerance,
+                (1.0, 0.0, 0.0, 0.0),
+                options,
+                is_rotation=True,
+            )
+            if track is not None:
+                frames, rotations = track
+                channels += [Channel(rotation_path, i, frames, rotations[:, i]) for i in range(4)]
+
+        if bone_mask.scale and len(bone.scale):
+            track = reduce_track(
+                bone.scale.frames,
+                convert_scales(rest_pose, bone.scale.values),
+                options.scale_tolerance,
+                (1.0, 1.0, 1.0),
+                options,
+                is_rotation=False,
+            )
+            if track is not None:
+                frames, scales = track
+                channels += [Channel(scale_path, i, frames, scales[:, i]) for i in range(3)]
+
+        if bone_mask.location and len(bone.location):
+            track = reduce_track(
+                bone.location.frames,
+                convert_locations(rest_pose, bone_index, bone.location.values),
+                options.location_tolerance,
+                (0.0, 0.0, 0.0),
+                options,
+                is_rotation=False,
+            )
+            if track is not None:
+                frames, locations = track
+                channels += [Channel(location_path, i, frames, locations[:, i]) for i in range(3)]
+
+    return channels
+
+
+def get_keyframe_interpolation(options: AnimationOptions) -> int:
+    """Get the interpolation of new keyframes, linear when reduced as the reduction error assumes linear segments."""
+    interpolation = (
+        'LINEAR' if options.reduce_keyframes else bpy.context.preferences.edit.keyframe_new_interpolation_type
+    )
+    return bpy.types.Keyframe.bl_rna.properties["interpolation"].enum_items[interpolation].value
+
+
+def write_channels(anim_data: bpy.types.AnimData, channels: list[Channel], options: AnimationOptions) -> None:
+    """Create the fcurves of every channel in the assigned action at once."""
+    # every channel can be masked or skipped
+    if not channels:
+        return
+
     if bpy.app.version[0] >= 5:
         channelbag = bpy_extras.anim_utils.action_ensure_channelbag_for_slot(anim_data.action, anim_data.action_slot)
-        f_curve = channelbag.fcurves.new(data_path, index=index)
+        fcurves = channelbag.fcurves
     else:
-        f_curve = anim_data.action.fcurves.new(data_path, index=index)
-    f_curve.keyframe_points.add(count=int(len(data) / 2))
-    f_curve.keyframe_points.foreach_set("co", data)
-    f_curve.update()
+        fcurves = anim_data.action.fcurves
 
+    keyframe_counts = [len(channel.frames) for channel in channels]
+    offsets = np.concatenate(([0], np.cumsum(keyframe_counts, dtype=np.int64) * 2))
 
-def import_animation(
-    context: bpy.types.Context,
+    # interleaved frame and value pairs of every channel in one buffer
+    coordinates = np.empty(offsets[-1], dtype=np.float32)
+    for channel, offset, keyframe_count in zip(channels, offsets, keyframe_counts):
+        coordinates[offset : offset + (keyframe_count * 2) : 2] = channel.frames + 1
+        coordinates[offset + 1 : offset + (keyframe_count * 2) : 2] = channel.values
+
+    f_curves = [fcurves.new(channel.data_path, index=channel.index) for channel in channels]
+
+    interpolation = get_keyframe_interpolation(options)
+
+    for f_curve, offset, keyframe_count in zip(f_curves, offsets, keyframe_counts):
+        f_curve.keyframe_points.add(count=keyframe_count)
+        f_curve.keyframe_points.foreach_set("co", coordinates[offset : offset + (keyframe_count * 2)])
+        f_curve.keyframe_points.foreach_set("interpolation", [interpolation] * keyframe_count)
+
+    for f_curve in f_curves:
+        f_curve.update()
+
+
+def load_animation(
     logger: logging.Logger,
     file_path: pathlib.Path,
     game_type: utils.GameType | None,
     endianness: str | None,
-    armature_object: bpy.types.Object,
-) -> None:
-    """Import an animation file."""
-    anim_desc = None
+    bone_masks: list[animation.BoneMask],
+    frame_range: tuple[int, int] | None,
+) -> animation.Animation | None:
+    """Load an animation file, detecting the game type and endianness if they are not known.
 
+    With a frame range only the keyframes covering it are decompressed.
+    """
     if game_type is not None and endianness is not None:
         try:
-            anim_desc = animation.read_file(file_path, game_type, endianness)
+            return animation.read_file(file_path, game_type, endianness, frame_range, bone_masks)
         except utils.FileReadError as _:
             logger.info(f"Could not load animation {file_path}")  # noqa: G004
-            return
-    else:
-        game_types = [x for x in utils.GameType for _ in range(2)]
-        for game_type, endianness in zip(game_types, itertools.cycle(['<', '>'])):
-            try:
-                anim_desc = animation.read_file(file_path, game_type, endianness)
-                break
-            except utils.FileReadError as _:
-                continue
+            return None
 
-    if anim_desc is None:
-        logger.info(f"Could not load animation {file_path}")  # noqa: G004
-        return
+    game_types = [x for x in utils.GameType for _ in range(2)]
+    for game_type, endianness in zip(game_types, itertools.cycle(['<', '>'])):
+        try:
+            return animation.read_file(file_path, game_type, endianness, frame_range, bone_masks)
+        except utils.FileReadError as _:
+            continue
+
+    logger.info(f"Could not load animation {file_path}")  # noqa: G004
+    return None
+
+
+FINGERPRINT_TABLE_FILE_NAME = "animation_fingerprints.json"
+
+
+class FingerprintTable:
+    """Persisted fingerprints of decoded animation files, so files that were imported before need not be decoded."""
+
+    fingerprints: dict[str, str] | None
+    is_modified: bool
+
+    def __init__(self) -> None:
+        """Initialize a FingerprintTable."""
+        self.fingerprints = None
+        self.is_modified = False
+
+    def get_fingerprints(self) -> dict[str, str]:
+        """Get the fingerprints, reading them from the cache file the first time."""
+        if self.fingerprints is None:
+            self.fingerprints = disk_cache.read_json(FINGERPRINT_TABLE_FILE_NAME)
 
+        return self.fingerprints
+
+    def get(self, key: str) -> str | None:
+        """Get the fingerprint of a file key."""
+        return self.get_fingerprints().get(key)
+
+    def set(self, key: str, fingerprint: str) -> None:
+        """Set the fingerprint of a file key."""
+        fingerprints = self.get_fingerprints()
+        if fingerprints.get(key) != fingerprint:
+            fingerprints[key] = fingerprint
+            self.is_modified = True
+
+    def save(self) -> None:
+        """Write the fingerprints to the cache file if they changed."""
+        if self.fingerprints is not None and self.is_modified:
+            disk_cache.write_json(FINGERPRINT_TABLE_FILE_NAME, self.fingerprints)
+            self.is_modified = False
+
+
+FINGERPRINT_TABLE = FingerprintTable()
+
+
+def save_fingerprint_table() -> None:
+    """Write the fingerprints of the decoded animation files to the cache file."""
+    FINGERPRINT_TABLE.save()
+
+
+def get_file_key(
+    file_path: pathlib.Path,
+    bone_masks: list[animation.BoneMask],
+    frame_range: tuple[int, int] | None,
+) -> str | None:
+    """Get the fingerprint table key of an animation file read with bone masks and a frame range."""
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+
+    mask_key = hashlib.blake2b(digest_size=8)
+    for bone_mask in bone_masks:
+        mask_key.update(bytes((bone_mask.rotation, bone_mask.scale, bone_mask.location)))
+
+    return f"{file_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{mask_key.hexdigest()}|{frame_range}"
+
+
+def get_action_fingerprint(animation_fingerprint: str, options: AnimationOptions) -> str:
+    """Get the fingerprint of the action created from an animation with the options that change its fcurves."""
+    fingerprint = hashlib.blake2b(digest_size=16)
+    fingerprint.update(animation_fingerprint.encode('ascii'))
+    fingerprint.update(
+        repr(
+            (
+                options.reduce_keyframes,
+                options.rotation_tolerance,
+                options.location_tolerance,
+                options.scale_tolerance,
+                options.skip_rest_pose_channels,
+                options.frame_range,
+            ),
+        ).encode('ascii'),
+    )
+
+    return fingerprint.hexdigest()
+
+
+class ActionIndex:
+    """Imported actions keyed by fingerprint and rest pose, read from the blend file once per batch of files."""
+
+    actions: dict[tuple[str, str], bpy.types.Action]
+
+    def __init__(self) -> None:
+        """Initialize an ActionIndex from the actions of the blend file."""
+        self.actions = {}
+        for action in bpy.data.actions:
+            fingerprint = action.get("tsc_fingerprint")
+            rest_pose_key = action.get("tsc_rest_pose")
+            if fingerprint is not None and rest_pose_key is not None:
+                self.actions.setdefault((fingerprint, rest_pose_key), action)
+
+    def find(self, fingerprint: str, rest_pose_key: str) -> bpy.types.Action | None:
+        """Find a previously imported action with the same motion for a rest pose."""
+        return self.actions.get((fingerprint, rest_pose_key))
+
+    def add(self, action: bpy.types.Action) -> None:
+        """Add an action created during the import."""
+        self.actions.setdefault((action["tsc_fingerprint"], action["tsc_rest_pose"]), action)
+
+
+def add_animation_track(anim_data: bpy.types.AnimData, action: bpy.types.Action, frame: int) -> bpy.types.NlaTrack:
+    """Add an NLA track holding a strip of an action."""
+    name = action.get("tsc_animation", action.name)
+
+    track = anim_data.nla_tracks.new(prev=None)
+    track.name = name
+    track.strips.new(name, frame, action)
+
+    return track
+
+
+def add_to_action_library(action: bpy.types.Action) -> None:
+    """Keep an action without users. Library actions are matched to armatures by their rest pose."""
+    action.use_fake_user = True
+
+
+def get_library_actions(armature_object: bpy.types.Object) -> list[bpy.types.Action]:
+    """Get the imported actions that can be applied to an armature."""
+    rest_pose_key = get_rest_pose(armature_object).key
+
+    return [x for x in bpy.data.actions if x.get("tsc_rest_pose") == rest_pose_key]
+
+
+def apply_existing_action(
+    action: bpy.types.Action, armature_object: bpy.types.Object, options: AnimationOptions
+) -> None:
+    """Apply a previously imported action to an armature."""
+    anim_data = armature_object.animation_data_create()
+    anim_data.action = action
+    anim_data.action_slot = anim_data.action_suitable_slots[0]
+
+    if options.action_library:
+        add_to_action_library(action)
+
+    if not options.action_library or not anim_data.nla_tracks:
+        add_animation_track(anim_data, action, 1).mute = True
+
+
+def apply_animation(
+    context: bpy.types.Context,
+    logger: logging.Logger,
+    anim_desc: animation.Animation,
+    armature_object: bpy.types.Object,
+    bone_masks: list[animation.BoneMask],
+    action_index: ActionIndex,
+    *,
+    options: AnimationOptions,
+) -> str | None:
+    """Apply a decoded animation to an armature and get its fingerprint.
+
+    Identical motion shares one action per rest pose.
+    In action library mode only the first animation of an armature gets an NLA track, the rest are kept as fake user
+    actions that strips can be created from later.
+    """
     if len(anim_desc.bones) != len(armature_object.data.bones):
         logger.info(f"Could not apply animation {anim_desc.name} to {armature_object.name}")  # noqa: G004
-        return
+        return None
 
-    anim_data = armature_object.animation_data_create()
+    animation_fingerprint = animation.calculate_fingerprint(anim_desc, bone_masks)
+    action_fingerprint = get_action_fingerprint(animation_fingerprint, options)
 
-    action = bpy.data.actions.get(anim_desc.name)
-    if action is not None:
-        anim_data.action = action
-        anim_data.action_slot = anim_data.action_suitable_slots[0]
+    rest_pose = get_rest_pose(armature_object)
 
-        track = anim_data.nla_tracks.new(prev=None)
-        track.name = anim_desc.name
-        track.strips.new(anim_desc.name, 1, action)
+    action = action_index.find(action_fingerprint, rest_pose.key)
+    if action is not None:
+        apply_existing_action(action, armature_object, options)
+        return animation_fingerprint
 
-        return
+    anim_data = armature_object.animation_data_create()
 
     action = bpy.data.actions.new(name=anim_desc.name)
+    action["tsc_animation"] = anim_desc.name
+    action["tsc_rest_pose"] = rest_pose.key
+    action["tsc_fingerprint"] = action_fingerprint
+    action_index.add(action)
     anim_data.action = action
     if bpy.app.version[0] >= 5:
         anim_data.action_slot = action.slots.new(id_type='OBJECT', name="slot")
 
-    action.frame_range = (1.0, anim_desc.frame_count)
+    frame_start, frame_end = options.frame_range if options.frame_range is not None else (1, anim_desc.frame_count)
+    action.frame_range = (float(frame_start), float(frame_end))
 
-    for pose_bone, keyframes in zip(armature_object.pose.bones, anim_desc.bones):
-        bone_rotation = pose_bone.bone.matrix_local.to_quaternion()
+    write_channels(anim_data, create_channels(rest_pose, anim_desc, options, bone_masks), options)
 
-        rotation_keyframes_w = []
-        rotation_keyframes_x = []
-        rotation_keyframes_y = []
-        rotation_keyframes_z = []
-        for keyframe in keyframes.rotation_keyframes:
-            frame = float(keyframe.frame + 1)
-
-            rotation = ((bone_rotation.inverted() @ keyframe.rotation) @ bone_rotation).normalized()
-
-            rotation_keyframes_w += (frame, rotation.w)
-            rotation_keyframes_x += (frame, rotation.x)
-            rotation_keyframes_y += (frame, rotation.y)
-            rotation_keyframes_z += (frame, rotation.z)
-
-        if rotation_keyframes_w:
-            data_path = pose_bone.path_from_id("rotation_quaternion")
-            create_fcurve_data(anim_data, data_path, 0, rotation_keyframes_w)
-            create_fcurve_data(anim_data, data_path, 1, rotation_keyframes_x)
-            create_fcurve_data(anim_data, data_path, 2, rotation_keyframes_y)
-            create_fcurve_data(anim_data, data_path, 3, rotation_keyframes_z)
-
-        scale_keyframes_x = []
-        scale_keyframes_y = []
-        scale_keyframes_z = []
-        for keyframe in keyframes.scale_keyframes:
-            frame = float(keyframe.frame + 1)
-
-            scale = (mathutils.Matrix.LocRotScale(None, None, keyframe.vector) @ utils.BONE_ROTATION_OFFSET).to_scale()
-
-            scale_keyframes_x += (frame, scale.x)
-            scale_keyframes_y += (frame, scale.y)
-            scale_keyframes_z += (frame, scale.z)
-
-        if scale_keyframes_x:
-            data_path = pose_bone.path_from_id("scale")
-            create_fcurve_data(anim_data, data_path, 0, scale_keyframes_x)
-            create_fcurve_data(anim_data, data_path, 1, scale_keyframes_y)
-            create_fcurve_data(anim_data, data_path, 2, scale_keyframes_z)
-
-        location_keyframes_x = []
-        location_keyframes_y = []
-        location_keyframes_z = []
-        for keyframe in keyframes.location_keyframes:
-            frame = float(keyframe.frame + 1)
-
-            location = bone_rotation.inverted() @ keyframe.vector
-
-            location_keyframes_x += (frame, location.x)
-            location_keyframes_y += (frame, location.y)
-            location_keyframes_z += (frame, location.z)
-
-        if location_keyframes_x:
-            data_path = pose_bone.path_from_id("location")
-            create_fcurve_data(anim_data, data_path, 0, location_keyframes_x)
-            create_fcurve_data(anim_data, data_path, 1, location_keyframes_y)
-            create_fcurve_data(anim_data, data_path, 2, location_keyframes_z)
+    if options.action_library:
+        add_to_action_library(action)
 
-    track = anim_data.nla_tracks.new(prev=None)
-    track.name = anim_desc.name
-    track.strips.new(anim_desc.name, 1, action)
-    track.mute = True
+    if not options.action_library or not anim_data.nla_tracks:
+        add_animation_track(anim_data, action, 1).mute = True
 
     context.scene.render.fps = 60
-    context.scene.frame_end = max(context.scene.frame_end, anim_desc.frame_count)
+    context.scene.frame_end = max(context.scene.frame_end, frame_end)
+
+    return animation_fingerprint
+
+
+AnimationTarget = tuple[bpy.types.Object, list[animation.BoneMask], str | None]
+
+
+def apply_imported_actions(
+    file_path: pathlib.Path,
+    armature_objects: list[bpy.types.Object],
+    bone_mask_lists: list[list[animation.BoneMask]],
+    action_index: ActionIndex,
+    options: AnimationOptions,
+) -> list[AnimationTarget]:
+    """Apply the actions already made from an animation file and get the armatures that still need it decoded."""
+    remaining = []
+
+    for armature_object, bone_masks in zip(armature_objects, bone_mask_lists):
+        file_key = get_file_key(file_path, bone_masks, options.frame_range)
+        animation_fingerprint = FINGERPRINT_TABLE.get(file_key) if file_key is not None else None
+        if animation_fingerprint is not None:
+            action_fingerprint = get_action_fingerprint(animation_fingerprint, options)
+            action = action_index.find(action_fingerprint, get_rest_pose(armature_object).key)
+            if action is not None:
+                apply_existing_action(action, armature_object, options)
+                continue
+
+        remaining.append((armature_object, bone_masks, file_key))
+
+    return remaining
+
+
+def apply_decoded_animation(
+    context: bpy.types.Context,
+    logger: logging.Logger,
+    anim_desc: animation.Animation,
+    targets: list[AnimationTarget],
+    action_index: ActionIndex,
+    options: AnimationOptions,
+) -> None:
+    """Apply a decoded animation to armatures and remember the fingerprint of its file."""
+    for armature_object, bone_masks, file_key in targets:
+        animation_fingerprint = apply_animation(
+            context,
+            logger,
+            anim_desc,
+            armature_object,
+            bone_masks,
+            action_index,
+            options=options,
+        )
+
+        if animation_fingerprint is not None and file_key is not None:
+            FINGERPRINT_TABLE.set(file_key, animation_fingerprint)
+
+
+def import_animations(
+    context: bpy.types.Context,
+    logger: logging.Logger,
+    file_paths: list[pathlib.Path],
+    game_type: utils.GameType | None,
+    endianness: str | None,
+    armature_objects: list[bpy.types.Object],
+    action_index: ActionIndex,
+    *,
+    options: AnimationOptions,
+) -> None:
+    """Import animation files, decoding each once and applying it to every armature.
+
+    Armatures that already have an action made from a file with the same fingerprint skip decoding. The files are
+    decoded in a thread pool while the actions are created on the main thread in file order.
+    """
+    bone_mask_lists = [create_bone_masks(armature_object, options) for armature_object in armature_objects]
+
+    pending = []
+    for file_path in file_paths:
+        targets = apply_imported_actions(file_path, armature_objects, bone_mask_lists, action_index, options)
+        if targets:
+            pending.append((file_path, targets))
+
+    if not pending:
+        return
+
+    def decode(file_path: pathlib.Path, targets: list[AnimationTarget]) -> animation.Animation | None:
+        return load_animation(
+            logger,
+            file_path,
+            game_type,
+            endianness,
+            merge_bone_masks([x[1] for x in targets]),
+            get_animation_frame_range(options),
+        )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as executor:
+        anim_descs = executor.map(decode, *zip(*pending))
+
+        for (_, targets), anim_desc in zip(pending, anim_descs):
+            if anim_desc is not None:
+                apply_decoded_animation(context, logger, anim_desc, targets, action_index, options)
+
+
+def import_animation(
+    context: bpy.types.Context,
+    logger: logging.Logger,
+    file_path: pathlib.Path,
+    game_type: utils.GameType | None,
+    endianness: str | None,
+    armature_objects: list[bpy.types.Object],
+    action_index: ActionIndex,
+    *,
+    options: AnimationOptions,
+) -> None:
+    """Import an animation file, decoding it once and applying it to every armature."""
+    import_animations(
+        context,
+        logger,
+        [file_path],
+        game_type,
+        endianness,
+        armature_objects,
+        action_index,
+        options=options,
+    )
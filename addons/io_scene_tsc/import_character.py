@@ -1,6 +1,7 @@
 """Import characters."""
 
 import bpy
+import collections.abc
 import copy
 import logging
 import math
@@ -16,7 +17,7 @@ from . import utils
 def import_character(
     context: bpy.types.Context,
     logger: logging.Logger,
-    character_id_file_path_map: dict[int, pathlib.Path],
+    character_id_file_path_map: collections.abc.Mapping[int, pathlib.Path],
     model_name: str,
     model_id: int,
     game_type: utils.GameType,
@@ -5,9 +5,12 @@ import logging
 import pathlib
 
 
-from . import id_file_path_map
+from . import game_root
 from . import import_animation
 from . import import_model
+from . import import_shader
+from . import import_texture
+from . import texture_info
 from . import utils
 
 
@@ -21,48 +24,75 @@ def import_files(
     invert_normals: bool,
     cleanup_meshes: bool,
     backface_culling: bool,
+    decode_textures_in_parallel: bool,
+    use_texture_proxies: bool,
+    texture_proxy_size: int,
+    apply_to_selected: bool,
+    animation_options: import_animation.AnimationOptions,
 ) -> None:
     """Import all the models in the selected files."""
+    selected_armature_objects = (
+        [x for x in context.selected_objects if x.type == 'ARMATURE'] if apply_to_selected else []
+    )
+
     if bpy.ops.object.mode_set.poll():
         bpy.ops.object.mode_set(mode='OBJECT')
 
     if bpy.ops.object.select_all.poll():
         bpy.ops.object.select_all(action='DESELECT')
 
-    id_file_path_maps = id_file_path_map.IDFilePathMaps(
-        file_paths[0].parent.parent / "characters",
-        file_paths[0].parent.parent / "animations",
-        file_paths[0].parent.parent / "shaders",
-        file_paths[0].parent.parent / "textures",
-    )
+    import_animation.clear_rest_pose_cache()
+    action_index = import_animation.ActionIndex()
+
+    game_root_index = game_root.get_game_root_index(file_paths[0].parent.parent)
 
-    object_list = []
-
-    for file_path in file_paths:
-        try:
-            object_list += import_model.import_model(
-                context,
-                logger,
-                file_path,
-                id_file_path_maps,
-                import_animations=import_animations,
-                flip_normals_x_axis=flip_normals_x_axis,
-                invert_normals=invert_normals,
-                backface_culling=backface_culling,
-            )
-        except utils.FileReadError as _:  # noqa: PERF203
-            if context.view_layer.objects.active is not None and context.view_layer.objects.active.type == 'ARMATURE':
-                import_animation.import_animation(
+    with import_texture.TextureLoader(
+        decode_in_parallel=decode_textures_in_parallel,
+        proxy_size=texture_proxy_size if use_texture_proxies else None,
+    ) as texture_loader:
+        material_cache = import_shader.MaterialCache(texture_loader)
+
+        object_list = []
+
+        for file_path in file_paths:
+            try:
+                object_list += import_model.import_model(
                     context,
                     logger,
                     file_path,
-                    None,
-                    None,
-                    context.view_layer.objects.active,
+                    game_root_index,
+                    material_cache,
+                    action_index,
+                    import_animations=import_animations,
+                    flip_normals_x_axis=flip_normals_x_axis,
+                    invert_normals=invert_normals,
+                    backface_culling=backface_culling,
+                    animation_options=animation_options,
                 )
-                continue
-
-            logger.info(f"Could not import {file_path} as model or animation")  # noqa: G004
+            except utils.FileReadError as _:  # noqa: PERF203
+                active_object = context.view_layer.objects.active
+                armature_objects = (
+                    [active_object] if active_object is not None and active_object.type == 'ARMATURE' else []
+                )
+                armature_objects += [x for x in selected_armature_objects if x not in armature_objects]
+
+                if armature_objects:
+                    import_animation.import_animation(
+                        context,
+                        logger,
+                        file_path,
+                        None,
+                        None,
+                        armature_objects,
+                        action_index,
+                        options=animation_options,
+                    )
+                    continue
+
+                logger.info(f"Could not import {file_path} as model or animation")  # noqa: G004
+
+    import_animation.save_fingerprint_table()
+    texture_info.save_texture_info_table()
 
     if cleanup_meshes and object_list:
         previous_active_object = context.view_layer.objects.active
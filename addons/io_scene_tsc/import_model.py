@@ -11,11 +11,12 @@ import pathlib
 
 from . import animation_id_lookup
 from . import checksum
-from . import id_file_path_map
+from . import game_root
 from . import import_animation
 from . import import_character
 from . import import_shader
 from . import model
+from . import shader_table
 from . import utils
 
 
@@ -23,12 +24,15 @@ def import_model(
     context: bpy.types.Context,
     logger: logging.Logger,
     file_path: pathlib.Path,
-    id_file_path_maps: id_file_path_map.IDFilePathMaps,
+    game_root_index: game_root.GameRootIndex,
+    material_cache: import_shader.MaterialCache,
+    action_index: import_animation.ActionIndex,
     *,
     import_animations: bool,
     flip_normals_x_axis: bool,
     invert_normals: bool,
     backface_culling: bool,
+    animation_options: import_animation.AnimationOptions,
 ) -> list[bpy.types.Object]:
     """Import a model file."""
     model_desc = model.read_file(file_path)
@@ -46,7 +50,7 @@ def import_model(
         armature_object = import_character.import_character(
             context,
             logger,
-            id_file_path_maps.characters.get(),
+            game_root_index.characters,
             model_desc.name,
             model_id,
             model_desc.game,
@@ -57,12 +61,27 @@ def import_model(
         armature_object = None
 
     is_object, animation_ids = animation_id_lookup.list_animation_ids_from_model_id(
-        file_path.parent.parent,
+        game_root_index.object_table_path,
+        game_root_index.object_table_size,
         model_desc.game,
         model_desc.endianness,
         model_id,
     )
 
+    shader_table_entries = shader_table.get_shader_table(game_root_index, model_desc.game, model_desc.endianness)
+
+    # the textures are loaded while the meshes are built
+    import_shader.prefetch_textures(
+        logger,
+        model_desc.game,
+        model_desc.endianness,
+        [x.shader_id for sub_model in model_desc.sub_models for x in sub_model.meshes],
+        game_root_index.shaders,
+        game_root_index.textures,
+        shader_table_entries,
+        material_cache,
+    )
+
     for sub_model_index, sub_model in enumerate(model_desc.sub_models):
         sub_model_collection_name = f"{model_desc.name} {sub_model_index}"
 
@@ -220,8 +239,10 @@ def import_model(
                 model_desc.game,
                 model_desc.endianness,
                 mesh_desc.shader_id,
-                id_file_path_maps.shaders.get(),
-                id_file_path_maps.textures.get(),
+                game_root_index.shaders,
+                game_root_index.textures,
+                shader_table_entries,
+                material_cache,
                 backface_culling=backface_culling,
             )
 
@@ -229,17 +250,17 @@ def import_model(
                 obj.data.materials.append(material)
 
     if armature_object:
-        for animation_id in animation_ids:
-            animation_file_path = id_file_path_maps.animations.get().get(animation_id)
-            if animation_file_path:
-                import_animation.import_animation(
-                    context,
-                    logger,
-                    animation_file_path,
-                    model_desc.game,
-                    model_desc.endianness,
-                    armature_object,
-                )
+        animation_file_paths = game_root_index.animations
+        import_animation.import_animations(
+            context,
+            logger,
+            [animation_file_paths[x] for x in animation_ids if x in animation_file_paths],
+            model_desc.game,
+            model_desc.endianness,
+            [armature_object],
+            action_index,
+            options=animation_options,
+        )
 
         if (
             armature_object.animation_data
@@ -1,82 +1,305 @@
 """Import shaders."""
 
 import bpy
+import collections.abc
+import dataclasses
 import logging
 import pathlib
 
 
+from . import import_texture
 from . import shader
+from . import shader_table
+from . import texture_info
 from . import utils
 
 
+IMAGE_NODE_NAME = "Image Texture"
+TINT_NODE_NAME = "Tint"
+SPECULAR_IMAGE_NODE_NAME = "Specular Texture"
+
+
+@dataclasses.dataclass(frozen=True)
+class MaterialTemplate:
+    """Node layout of a material, which is copied from a template material instead of being built node by node."""
+
+    is_tinted: bool
+    has_texture_alpha: bool
+    has_specular: bool
+    has_specular_alpha: bool
+
+    def get_name(self) -> str:
+        """Get the name of the template material, which the leading dot hides from the material lists."""
+        name = ".TSC Template"
+        if self.is_tinted:
+            name += " Tinted"
+        if self.has_texture_alpha:
+            name += " Alpha"
+        if self.has_specular:
+            name += " Specular Alpha" if self.has_specular_alpha else " Specular"
+
+        return name
+
+
+def create_template_material(template: MaterialTemplate) -> bpy.types.Material:
+    """Create a template material with empty image nodes."""
+    material = bpy.data.materials.new(name=template.get_name())
+    material.use_nodes = True
+
+    image_node = material.node_tree.nodes.new('ShaderNodeTexImage')
+    image_node.name = IMAGE_NODE_NAME
+
+    principled_bsdf = material.node_tree.nodes.get('Principled BSDF')
+
+    if template.is_tinted:
+        mix_node = material.node_tree.nodes.new('ShaderNodeMix')
+        mix_node.name = TINT_NODE_NAME
+        mix_node.data_type = 'RGBA'
+        mix_node.blend_type = 'MULTIPLY'
+        mix_node.inputs['Factor'].default_value = 1.0
+
+        material.node_tree.links.new(image_node.outputs[0], mix_node.inputs[6])
+        material.node_tree.links.new(mix_node.outputs[2], principled_bsdf.inputs[0])
+    else:
+        material.node_tree.links.new(image_node.outputs[0], principled_bsdf.inputs[0])
+
+    specular_ior_index = 13 if bpy.app.version[0] >= 5 else 12
+
+    principled_bsdf.inputs[2].default_value = 1.0
+    principled_bsdf.inputs[specular_ior_index].default_value = 0.0
+
+    if template.has_texture_alpha:
+        material.node_tree.links.new(image_node.outputs[1], principled_bsdf.inputs[4])
+        material.blend_method = 'HASHED'
+
+    if template.has_specular:
+        principled_bsdf.inputs[2].default_value = 0.5
+
+        specular_image_node = material.node_tree.nodes.new('ShaderNodeTexImage')
+        specular_image_node.name = SPECULAR_IMAGE_NODE_NAME
+
+        if template.has_specular_alpha:
+            material.node_tree.links.new(specular_image_node.outputs[0], principled_bsdf.inputs[4])
+            material.blend_method = 'HASHED'
+        else:
+            material.node_tree.links.new(specular_image_node.outputs[0], principled_bsdf.inputs[specular_ior_index])
+
+    return material
+
+
+def get_template_material(template: MaterialTemplate) -> bpy.types.Material:
+    """Get the template material of a node layout, creating it the first time it is used in a blend file."""
+    material = bpy.data.materials.get(template.get_name(), None)
+    if material is None:
+        material = create_template_material(template)
+
+    return material
+
+
 def create_material(
     material_name: str,
     texture_file_path: pathlib.Path,
+    texture_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
     diffuse_color: tuple[float, float, float],
+    texture_loader: import_texture.TextureLoader,
     *,
     backface_culling: bool,
     has_alpha: bool,
 ) -> bpy.types.Material:
-    """Create a material with the given texture file."""
+    """Create a material with the given texture file by copying the template material of its node layout.
+
+    Alpha and the specular texture are found from the texture header and the texture map, not the loaded images.
+    """
     material = bpy.data.materials.get(material_name, None)
 
     if material is None:
-        material = bpy.data.materials.new(name=material_name)
+        image = texture_loader.get_image(texture_file_path)
+
+        specular_file_path = texture_info.find_specular_file_path(texture_file_path, texture_file_path_id_map)
+        has_specular_alpha = specular_file_path is not None and has_alpha
+
+        # the loaded image is only checked when the texture header cannot be read
+        texture = texture_info.get_texture_info(texture_file_path)
+        has_texture_alpha = texture.has_alpha if texture is not None else image.depth == 32
+
+        template = MaterialTemplate(
+            is_tinted=diffuse_color != (1.0, 1.0, 1.0),
+            # the specular texture replaces the texture alpha
+            has_texture_alpha=has_texture_alpha and not has_specular_alpha,
+            has_specular=specular_file_path is not None,
+            has_specular_alpha=has_specular_alpha,
+        )
+
+        material = get_template_material(template).copy()
+        material.name = material_name
+
+        nodes = material.node_tree.nodes
+        nodes[IMAGE_NODE_NAME].image = image
+
+        if template.is_tinted:
+            nodes[TINT_NODE_NAME].inputs[7].default_value = [*diffuse_color, 1.0]
+
+        if specular_file_path is not None:
+            nodes[SPECULAR_IMAGE_NODE_NAME].image = texture_loader.get_image(specular_file_path)
+
+        material.use_backface_culling = backface_culling
+
+    return material
 
-        image = bpy.data.images.get(texture_file_path.name)
-        if image is None:
-            image = bpy.data.images.load(texture_file_path.as_posix())
-        material.use_nodes = True
 
-        image_node = material.node_tree.nodes.new('ShaderNodeTexImage')
-        image_node.image = image
+@dataclasses.dataclass(frozen=True)
+class ResolvedShader:
+    """Shader with its shader IDs indirection followed and its texture found."""
 
-        principled_bsdf = material.node_tree.nodes.get('Principled BSDF')
+    name: str
+    texture_file_path: pathlib.Path
+    diffuse_color: tuple[float, float, float]
+    has_alpha: bool
 
-        if diffuse_color != (1.0, 1.0, 1.0):
-            mix_node = material.node_tree.nodes.new('ShaderNodeMix')
-            mix_node.data_type = 'RGBA'
-            mix_node.blend_type = 'MULTIPLY'
-            mix_node.inputs['Factor'].default_value = 1.0
-            mix_node.inputs[7].default_value = [*diffuse_color, 1.0]
 
-            material.node_tree.links.new(image_node.outputs[0], mix_node.inputs[6])
-            material.node_tree.links.new(mix_node.outputs[2], principled_bsdf.inputs[0])
+def resolve_shader(
+    logger: logging.Logger,
+    game_type: utils.GameType,
+    endianness: str,
+    shader_id: int,
+    shader_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+    texture_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+) -> ResolvedShader | None:
+    """Read a shader, following a shader IDs file to the shader it points to, and find its texture."""
+    shader_file_path = shader_file_path_id_map.get(shader_id)
+    if shader_file_path is None:
+        return None
+
+    shader_desc = None
+    try:
+        shader_desc = shader.read_file(shader_file_path, game_type, endianness)
+    except utils.FileReadError as _:
+        logger.info(f"Could not import shader {shader_file_path}")  # noqa: G004
+
+    if type(shader_desc) is shader.ShaderIDs:
+        shader_file_path = shader_file_path_id_map.get(shader_desc.ids[-1])
+
+        if shader_file_path is not None:
+            try:
+                shader_desc = shader.read_file(shader_file_path, game_type, endianness)
+            except utils.FileReadError as _:
+                shader_desc = None
+                logger.info(f"Could not import shader {shader_file_path}")  # noqa: G004
         else:
-            material.node_tree.links.new(image_node.outputs[0], principled_bsdf.inputs[0])
+            shader_desc = None
 
-        specular_ior_index = 13 if bpy.app.version[0] >= 5 else 12
+    if shader_desc is None or not shader_desc.render_passes:
+        return None
 
-        principled_bsdf.inputs[2].default_value = 1.0
-        principled_bsdf.inputs[specular_ior_index].default_value = 0.0
+    render_pass = shader_desc.render_passes[0]
 
-        if image.depth == 32:
-            material.node_tree.links.new(image_node.outputs[1], principled_bsdf.inputs[4])
-            material.blend_method = 'HASHED'
+    texture_file_path = texture_file_path_id_map.get(render_pass.texture_id)
+    if not texture_file_path:
+        return None
 
-        specular_file_path = pathlib.Path(
-            texture_file_path.parent,
-            texture_file_path.stem + " specular" + texture_file_path.suffix,
-        )
-        if specular_file_path.is_file():
-            principled_bsdf.inputs[2].default_value = 0.5
+    return ResolvedShader(
+        shader_file_path.stem,
+        texture_file_path,
+        shader_desc.diffuse_color,
+        shader_table.get_has_alpha(game_type, render_pass),
+    )
 
-            specular_image = bpy.data.images.get(specular_file_path.name)
-            if specular_image is None:
-                specular_image = bpy.data.images.load(specular_file_path.as_posix())
 
-            specular_image_node = material.node_tree.nodes.new('ShaderNodeTexImage')
-            specular_image_node.image = specular_image
+def resolve_shader_table_entry(
+    entry: shader_table.ShaderTableEntry,
+    texture_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+) -> ResolvedShader | None:
+    """Find the texture of a shader table entry."""
+    texture_file_path = texture_file_path_id_map.get(entry.texture_id)
+    if not texture_file_path:
+        return None
 
-            if has_alpha:
-                material.node_tree.links.new(specular_image_node.outputs[0], principled_bsdf.inputs[4])
-                material.blend_method = 'HASHED'
-            else:
-                material.node_tree.links.new(specular_image_node.outputs[0], principled_bsdf.inputs[specular_ior_index])
+    return ResolvedShader(entry.name, texture_file_path, entry.diffuse_color, entry.has_alpha)
 
-        material.use_backface_culling = backface_culling
 
-    return material
+class MaterialCache:
+    """Shaders resolved and materials created during an import, so each shader file is read at most once.
+
+    Materials are shared by every shader with the same texture and parameters.
+    """
+
+    shaders: dict[tuple[utils.GameType, str, int], ResolvedShader | None]
+    materials: dict[tuple[pathlib.Path, tuple[float, float, float], bool, bool], bpy.types.Material]
+    texture_loader: import_texture.TextureLoader
+
+    def __init__(self, texture_loader: import_texture.TextureLoader) -> None:
+        """Initialize a MaterialCache."""
+        self.shaders = {}
+        self.materials = {}
+        self.texture_loader = texture_loader
+
+
+def get_resolved_shader(
+    logger: logging.Logger,
+    game_type: utils.GameType,
+    endianness: str,
+    shader_id: int,
+    shader_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+    texture_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+    shader_table_entries: collections.abc.Mapping[int, shader_table.ShaderTableEntry] | None,
+    material_cache: MaterialCache,
+) -> ResolvedShader | None:
+    """Resolve a shader from the shader table of the game or its file, once per import."""
+    shader_key = (game_type, endianness, shader_id)
+    if shader_key not in material_cache.shaders:
+        entry = shader_table_entries.get(shader_id) if shader_table_entries is not None else None
+        if entry is not None:
+            material_cache.shaders[shader_key] = resolve_shader_table_entry(entry, texture_file_path_id_map)
+        else:
+            material_cache.shaders[shader_key] = resolve_shader(
+                logger,
+                game_type,
+                endianness,
+                shader_id,
+                shader_file_path_id_map,
+                texture_file_path_id_map,
+            )
+
+    return material_cache.shaders[shader_key]
+
+
+def prefetch_textures(
+    logger: logging.Logger,
+    game_type: utils.GameType,
+    endianness: str,
+    shader_ids: collections.abc.Iterable[int],
+    shader_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+    texture_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+    shader_table_entries: collections.abc.Mapping[int, shader_table.ShaderTableEntry] | None,
+    material_cache: MaterialCache,
+) -> None:
+    """Start loading the textures of the shaders that do not have materials yet."""
+    texture_file_paths = []
+
+    for shader_id in shader_ids:
+        resolved_shader = get_resolved_shader(
+            logger,
+            game_type,
+            endianness,
+            shader_id,
+            shader_file_path_id_map,
+            texture_file_path_id_map,
+            shader_table_entries,
+            material_cache,
+        )
+        if resolved_shader is None or bpy.data.materials.get(resolved_shader.name) is not None:
+            continue
+
+        texture_file_paths.append(resolved_shader.texture_file_path)
+
+        specular_file_path = texture_info.find_specular_file_path(
+            resolved_shader.texture_file_path,
+            texture_file_path_id_map,
+        )
+        if specular_file_path is not None:
+            texture_file_paths.append(specular_file_path)
+
+    material_cache.texture_loader.prefetch(texture_file_paths)
 
 
 def import_shader(
@@ -84,60 +307,48 @@ def import_shader(
     game_type: utils.GameType,
     endianness: str,
     shader_id: int,
-    shader_file_path_id_map: dict[int, pathlib.Path],
-    texture_file_path_id_map: dict[int, pathlib.Path],
+    shader_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+    texture_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+    shader_table_entries: collections.abc.Mapping[int, shader_table.ShaderTableEntry] | None,
+    material_cache: MaterialCache,
     *,
     backface_culling: bool,
 ) -> bpy.types.Material | None:
-    """Import a shader and create a Blender material for it."""
-    shader_file_path = shader_file_path_id_map.get(shader_id)
+    """Import a shader and create a Blender material for it, or get the material of an equal shader.
 
-    material = None
-
-    if shader_file_path is not None:
-        shader_desc = None
-        try:
-            shader_desc = shader.read_file(shader_file_path, game_type, endianness)
-        except utils.FileReadError as _:
-            logger.info(f"Could not import shader {shader_file_path}")  # noqa: G004
-
-        if type(shader_desc) is shader.ShaderIDs:
-            shader_file_path = shader_file_path_id_map.get(shader_desc.ids[-1])
-
-            if shader_file_path is not None:
-                try:
-                    shader_desc = shader.read_file(shader_file_path, game_type, endianness)
-                except utils.FileReadError as _:
-                    shader_desc = None
-                    logger.info(f"Could not import shader {shader_file_path}")  # noqa: G004
-            else:
-                shader_desc = None
+    Shaders in the shader table of the game are not read from their files.
+    """
+    resolved_shader = get_resolved_shader(
+        logger,
+        game_type,
+        endianness,
+        shader_id,
+        shader_file_path_id_map,
+        texture_file_path_id_map,
+        shader_table_entries,
+        material_cache,
+    )
+    if resolved_shader is None:
+        return None
+
+    material_key = (
+        resolved_shader.texture_file_path,
+        resolved_shader.diffuse_color,
+        resolved_shader.has_alpha,
+        backface_culling,
+    )
 
-        if shader_desc is not None and shader_desc.render_passes:
-            render_pass = shader_desc.render_passes[0]
-
-            match game_type:
-                case utils.GameType.THESIMS | utils.GameType.THESIMSBUSTINOUT:
-                    has_alpha = render_pass.flags & 0x4 != 0
-                case (
-                    utils.GameType.THEURBZ
-                    | utils.GameType.THESIMS2
-                    | utils.GameType.THESIMS2PETS
-                    | utils.GameType.THESIMS2CASTAWAY
-                ):
-                    has_alpha = render_pass.raster_modes & 0x40 != 0 or render_pass.flags & 0x4 != 0
-                case _:
-                    has_alpha = False
-
-            texture_file_path = texture_file_path_id_map.get(render_pass.texture_id)
-
-            if texture_file_path:
-                material = create_material(
-                    shader_file_path.stem,
-                    texture_file_path,
-                    shader_desc.diffuse_color,
-                    has_alpha=has_alpha,
-                    backface_culling=backface_culling,
-                )
+    material = material_cache.materials.get(material_key)
+    if material is None:
+        material = create_material(
+            resolved_shader.name,
+            resolved_shader.texture_file_path,
+            texture_file_path_id_map,
+            resolved_shader.diffuse_color,
+            material_cache.texture_loader,
+            has_alpha=resolved_shader.has_alpha,
+            backface_culling=backface_culling,
+        )
+        material_cache.materials[material_key] = material
 
     return material
@@ -0,0 +1,194 @@
+"""Load textures into Blender images."""
+
+import bpy
+import collections.abc
+import concurrent.futures
+import os
+import pathlib
+import types
+import typing
+
+
+from . import texture_decoder
+from . import texture_proxy
+
+
+FULL_RESOLUTION_PROPERTY = "tsc_full_resolution"
+
+
+def get_proxy_image_name(file_path: pathlib.Path) -> str:
+    """Get the name of the proxy image of a texture."""
+    return f"{file_path.name} Proxy"
+
+
+def create_image(file_path: pathlib.Path, decoded_texture: texture_decoder.DecodedTexture) -> bpy.types.Image:
+    """Create an image filled with decoded pixels, which links its texture file like a loaded image."""
+    image = bpy.data.images.new(file_path.name, decoded_texture.width, decoded_texture.height, alpha=True)
+    image.pixels.foreach_set(decoded_texture.pixels.ravel())
+
+    # a generated image filled with pixels counts as an unsaved edit, a file image is saved as its path
+    image.filepath_raw = file_path.as_posix()
+    image.source = 'FILE'
+
+    return image
+
+
+class TextureLoader:
+    """Images of an import.
+
+    When decoding in parallel, the textures of the materials about to be created are decoded on a thread pool and the
+    images are filled on the main thread. Otherwise the images only link their files and Blender decodes them when they
+    are first displayed.
+
+    With a proxy size, textures larger than it are replaced by downscaled proxy images, created on the thread pool.
+    """
+
+    decode_in_parallel: bool
+    proxy_size: int | None
+    proxy_directory: pathlib.Path | None
+    executor: concurrent.futures.ThreadPoolExecutor | None
+    decodes: dict[pathlib.Path, concurrent.futures.Future]
+    proxies: dict[pathlib.Path, concurrent.futures.Future]
+
+    def __init__(self, *, decode_in_parallel: bool, proxy_size: int | None) -> None:
+        """Initialize a TextureLoader."""
+        self.decode_in_parallel = decode_in_parallel
+        self.proxy_size = proxy_size
+        self.proxy_directory = texture_proxy.get_proxy_directory() if proxy_size is not None else None
+        self.executor = (
+            concurrent.futures.ThreadPoolExecutor(os.cpu_count() or 1)
+            if decode_in_parallel or proxy_size is not None
+            else None
+        )
+        self.decodes = {}
+        self.proxies = {}
+
+    def __enter__(self) -> typing.Self:
+        """Enter the import."""
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        """Stop the decoding of the textures that were not used."""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    def prefetch(self, file_paths: collections.abc.Iterable[pathlib.Path]) -> None:
+        """Start creating the proxies or decoding the textures that do not have images yet."""
+        if self.executor is None:
+            return
+
+        for file_path in file_paths:
+            if bpy.data.images.get(file_path.name) is not None:
+                continue
+
+            if self.proxy_size is not None:
+                if file_path not in self.proxies and bpy.data.images.get(get_proxy_image_name(file_path)) is None:
+                    self.proxies[file_path] = self.executor.submit(
+                        texture_proxy.create_proxy,
+                        file_path,
+                        self.proxy_directory,
+                        self.proxy_size,
+                    )
+            elif file_path not in self.decodes:
+                self.decodes[file_path] = self.executor.submit(texture_decoder.decode_texture, file_path)
+
+    def get_proxy_image(self, file_path: pathlib.Path) -> bpy.types.Image | None:
+        """Get the proxy image of a texture, or None if the texture is small enough to be used as it is."""
+        proxy_image_name = get_proxy_image_name(file_path)
+
+        image = bpy.data.images.get(proxy_image_name)
+        if image is not None:
+            return image
+
+        proxy = self.proxies.pop(file_path, None)
+        proxy_file_path = (
+            proxy.result()
+            if proxy is not None
+            else texture_proxy.create_proxy(file_path, self.proxy_directory, self.proxy_size)
+        )
+        if proxy_file_path is None:
+            return None
+
+        image = bpy.data.images.load(proxy_file_path.as_posix())
+        image.name = proxy_image_name
+        image[FULL_RESOLUTION_PROPERTY] = file_path.as_posix()
+
+        return image
+
+    def get_image(self, file_path: pathlib.Path) -> bpy.types.Image:
+        """Get the image of a texture, or its proxy image, creating it if it does not exist."""
+        image = bpy.data.images.get(file_path.name)
+        if image is not None:
+            return image
+
+        if self.proxy_size is not None:
+            image = self.get_proxy_image(file_path)
+            if image is not None:
+                return image
+
+        if not self.decode_in_parallel:
+            return bpy.data.images.load(file_path.as_posix())
+
+        decode = self.decodes.pop(file_path, None)
+        decoded_texture = decode.result() if decode is not None else texture_decoder.decode_texture(file_path)
+
+        # textures the decoder does not support are left to blender
+        if decoded_texture is None:
+            return bpy.data.images.load(file_path.as_posix())
+
+        return create_image(file_path, decoded_texture)
+
+
+def load_full_resolution_image(proxy_image: bpy.types.Image) -> bpy.types.Image:
+    """Get the full resolution image of a proxy image, or the proxy image if its texture file cannot be loaded."""
+    file_path = pathlib.Path(proxy_image[FULL_RESOLUTION_PROPERTY])
+
+    image = bpy.data.images.get(file_path.name)
+    if image is not None:
+        return image
+
+    try:
+        return bpy.data.images.load(file_path.as_posix())
+    except RuntimeError as _:
+        return proxy_image
+
+
+def load_full_resolution_images(materials: collections.abc.Iterable[bpy.types.Material]) -> int:
+    """Replace the proxy images of materials with their full resolution images and remove the unused proxy images.
+
+    Get the number of proxy images that were replaced.
+    """
+    full_resolution_images = {}
+
+    for material in materials:
+        if material.node_tree is None:
+            continue
+
+        for node in material.node_tree.nodes:
+            if node.type != 'TEX_IMAGE' or node.image is None or FULL_RESOLUTION_PROPERTY not in node.image:
+                continue
+
+            proxy_image_name = node.image.name
+            if proxy_image_name not in full_resolution_images:
+                full_resolution_images[proxy_image_name] = load_full_resolution_image(node.image)
+
+            node.image = full_resolution_images[proxy_image_name]
+
+    replaced_count = 0
+
+    for proxy_image_name, image in full_resolution_images.items():
+        proxy_image = bpy.data.images.get(proxy_image_name)
+        if proxy_image is None or proxy_image == image:
+            continue
+
+        replaced_count += 1
+
+        if proxy_image.users == 0:
+            bpy.data.images.remove(proxy_image)
+
+    return replaced_count
@@ -0,0 +1,79 @@
+"""Reduce keyframes that linear interpolation reproduces within a tolerance."""
+
+import numpy as np
+
+
+def rotation_error(rotations: np.ndarray, expected: np.ndarray) -> np.ndarray:
+    """Calculate the angle between wxyz quaternions."""
+    dot = np.abs(np.sum(rotations * expected, axis=-1))
+    return 2.0 * np.arccos(np.clip(dot, 0.0, 1.0))
+
+
+def vector_error(vectors: np.ndarray, expected: np.ndarray) -> np.ndarray:
+    """Calculate the distance between vectors."""
+    return np.linalg.norm(vectors - expected, axis=-1)
+
+
+def interpolate_rotations(start: np.ndarray, end: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """Interpolate wxyz quaternions the way linear fcurves and pose evaluation do, per component then normalized."""
+    rotations = start + ((end - start) * factors[:, np.newaxis])
+    lengths = np.linalg.norm(rotations, axis=1, keepdims=True)
+    lengths[lengths == 0.0] = 1.0
+    return rotations / lengths
+
+
+def interpolate_vectors(start: np.ndarray, end: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """Interpolate vectors linearly."""
+    return start + ((end - start) * factors[:, np.newaxis])
+
+
+def reduce_keyframes(
+    frames: np.ndarray,
+    values: np.ndarray,
+    tolerance: float,
+    *,
+    is_rotation: bool,
+) -> np.ndarray:
+    """Get the indices of the keyframes needed to reproduce a track within a tolerance.
+
+    Interior keyframes are dropped while interpolating between the last kept keyframe and a later one stays within the
+    tolerance of every original keyframe in between. A constant track is collapsed to its first keyframe.
+    """
+    if is_rotation:
+        error_function, interpolate_function = rotation_error, interpolate_rotations
+    else:
+        error_function, interpolate_function = vector_error, interpolate_vectors
+
+    keyframe_count = len(frames)
+    if keyframe_count <= 1:
+        return np.arange(keyframe_count)
+
+    if np.all(error_function(values, values[0]) <= tolerance):
+        return np.zeros(1, dtype=np.int64)
+
+    frames = frames.astype(np.float64)
+    values = values.astype(np.float64)
+
+    kept = [0]
+    anchor = 0
+    for end in range(2, keyframe_count):
+        factors = (frames[anchor + 1 : end] - frames[anchor]) / (frames[end] - frames[anchor])
+        interpolated = interpolate_function(values[anchor], values[end], factors)
+
+        if np.any(error_function(interpolated, values[anchor + 1 : end]) > tolerance):
+            anchor = end - 1
+            kept.append(anchor)
+
+    kept.append(keyframe_count - 1)
+
+    return np.array(kept, dtype=np.int64)
+
+
+def is_rest_value(values: np.ndarray, rest_value: tuple[float, ...], tolerance: float, *, is_rotation: bool) -> bool:
+    """Check whether every keyframe of a track is within a tolerance of the rest pose."""
+    rest_values = np.array(rest_value, dtype=np.float64)
+
+    if is_rotation:
+        return bool(np.all(rotation_error(values, rest_values) <= tolerance))
+
+    return bool(np.all(vector_error(values, rest_values) <= tolerance))
@@ -446,8 +446,8 @@ class Model:
     endianness: str
 
 
-def read_model(file: typing.BinaryIO) -> Model:
-    """Read a model."""
+def read_version(file: typing.BinaryIO) -> tuple[int, str, GameType]:
+    """Read the model version and find the endianness and game type from it."""
     match struct.unpack('<I', file.read(4))[0]:
         case 0x00:
             version, endianness, game_type = 0x00, '<', GameType.THESIMS
@@ -478,6 +478,24 @@ def read_model(file: typing.BinaryIO) -> Model:
         case _:
             raise utils.FileReadError
 
+    return version, endianness, game_type
+
+
+def read_file_game_type(file_path: pathlib.Path) -> tuple[GameType, str]:
+    """Read the game type and endianness of a model file from its version."""
+    try:
+        with file_path.open(mode='rb') as file:
+            _, endianness, game_type = read_version(file)
+            return game_type, endianness
+
+    except (OSError, struct.error) as exception:
+        raise utils.FileReadError from exception
+
+
+def read_model_header(file: typing.BinaryIO) -> tuple[int, str, GameType, str, float]:
+    """Read the model header up to the sub models and get the version, endianness, game type, name and scale."""
+    version, endianness, game_type = read_version(file)
+
     match game_type:
         case GameType.THESIMS | GameType.THESIMSBUSTINOUT:
             file.read(2)
@@ -522,10 +540,11 @@ def read_model(file: typing.BinaryIO) -> Model:
 
     scale = 1.0 / struct.unpack(endianness + 'f', file.read(4))[0]
 
-    sub_model_count = struct.unpack(endianness + 'I', file.read(4))[0]
+    return version, endianness, game_type, name, scale
 
-    sub_models = [read_sub_model(file, version, endianness, scale) for _ in range(sub_model_count)]
 
+def read_model_footer(file: typing.BinaryIO, game_type: GameType, endianness: str) -> None:
+    """Read the model footer after the sub models."""
     if len(file.read(64)) != 64:
         raise utils.FileReadError
 
@@ -543,6 +562,17 @@ def read_model(file: typing.BinaryIO) -> Model:
     if game_type == GameType.THESIMS3:
         read_light_info_exs(file, endianness)
 
+
+def read_model(file: typing.BinaryIO) -> Model:
+    """Read a model."""
+    version, endianness, game_type, name, scale = read_model_header(file)
+
+    sub_model_count = struct.unpack(endianness + 'I', file.read(4))[0]
+
+    sub_models = [read_sub_model(file, version, endianness, scale) for _ in range(sub_model_count)]
+
+    read_model_footer(file, game_type, endianness)
+
     return Model(
         name,
         sub_models,
@@ -551,6 +581,181 @@ def read_model(file: typing.BinaryIO) -> Model:
     )
 
 
+@dataclasses.dataclass
+class MeshSummary:
+    """Shader and vertex counts of a mesh, read without its vertex data."""
+
+    shader_id: int
+    position_count: int
+    index_count: int
+
+
+def skip_mesh(file: typing.BinaryIO, version: int, endianness: str) -> MeshSummary:
+    """Skip over a mesh, reading only its shader ID and counts."""
+    flags = struct.unpack(endianness + 'I', file.read(4))[0]
+
+    shader_id = struct.unpack(endianness + 'I', file.read(4))[0]
+
+    strip_count = struct.unpack(endianness + 'I', file.read(4))[0]
+    file.read(strip_count)
+
+    if version >= 0x01:
+        file.read(4)
+
+    if version >= 0x45:
+        file.read(48)
+
+    float_size = 2 if flags & MESH_FLAGS_HAS_SNORM_FLOATS else 4
+    uv_size = float_size * (4 if flags & MESH_FLAGS_HAS_UVS_2 else 2)
+
+    position_total = 0
+    index_total = 0
+    read_bone_weights = False
+
+    while True:
+        command = struct.unpack(endianness + 'B', file.read(1))[0]
+        match command:
+            case 0:
+                position_count = struct.unpack(endianness + 'I', file.read(4))[0]
+
+                if flags & MESH_FLAGS_HAS_SEPARATE_COUNTS:
+                    element_count = 3
+                    normal_count, color_count, uv_count = struct.unpack(endianness + '3I', file.read(12))
+                else:
+                    element_count = 4
+                    normal_count = position_count
+                    color_count = position_count
+                    uv_count = position_count
+
+                skip_length = position_count * float_size * element_count
+
+                if flags & MESH_FLAGS_HAS_UVS:
+                    skip_length += uv_count * uv_size
+
+                if flags & MESH_FLAGS_HAS_COLORS:
+                    skip_length += color_count * 4
+
+                if flags & MESH_FLAGS_HAS_NORMALS:
+                    skip_length += normal_count * (4 if version >= 0x3A and element_count == 4 else 3)
+
+                if read_bone_weights:
+                    skip_length += position_count * 4
+
+                if flags & MESH_FLAGS_HAS_MORPH_DELTAS:
+                    skip_length += position_count * 32
+
+                file.seek(skip_length, 1)
+
+                if flags & MESH_FLAGS_HAS_INDICES:
+                    index_total += skip_indices(file, version, endianness)
+
+                position_total += position_count
+
+                if version == 0x45 and endianness == '<':
+                    unknown_length = struct.unpack(endianness + 'I', file.read(4))[0]
+                    file.read(unknown_length)
+
+            case 1:
+                file.read(3)
+            case 2 | 4:
+                read_bone_weights = True
+            case 3 | 5:
+                read_bone_weights = False
+            case 6:
+                break
+
+    return MeshSummary(shader_id, position_total, index_total)
+
+
+def skip_indices(file: typing.BinaryIO, version: int, endianness: str) -> int:
+    """Skip over the indices of a mesh strip and get their count."""
+    if endianness == '>':
+        unknown_count = struct.unpack(endianness + 'I', file.read(4))[0]
+        file.read(1)  # channel count
+
+        indices_data_length = struct.unpack(endianness + 'I', file.read(4))[0]
+
+        file.read(4)
+        indices_data_start_pos = file.tell()
+        file.read(1)
+
+        index_count = struct.unpack(endianness + 'H', file.read(2))[0]
+
+        file.seek(indices_data_start_pos + indices_data_length)
+
+        read_unknown = True
+        if version >= 0x4A:
+            read_unknown = struct.unpack(endianness + 'B', file.read(1))[0] != 0
+
+        if version >= 0x45 and read_unknown:
+            file.read(unknown_count * 2)
+
+        return index_count
+
+    index_count = struct.unpack(endianness + 'I', file.read(4))[0]
+    file.seek(1 + (index_count * 2), 1)
+
+    return index_count
+
+
+@dataclasses.dataclass
+class SubModelSummary:
+    """Mesh summaries of a sub model."""
+
+    has_main_mesh: bool
+    meshes: list[MeshSummary]
+
+
+def skip_sub_model(file: typing.BinaryIO, version: int, endianness: str) -> SubModelSummary:
+    """Skip over a sub model, reading only the summaries of its meshes."""
+    file.read(4)
+
+    if version >= 0x45:
+        unknown_count = struct.unpack(endianness + 'I', file.read(4))[0]
+        for _ in range(unknown_count):
+            if len(file.read(7 * 4)) == 0:
+                raise utils.FileReadError
+
+    has_main_mesh = version >= 0x4A and struct.unpack(endianness + 'B', file.read(1))[0] != 0
+    if has_main_mesh:
+        skip_mesh(file, version, endianness)
+
+    mesh_count = struct.unpack(endianness + 'I', file.read(4))[0]
+
+    return SubModelSummary(has_main_mesh, [skip_mesh(file, version, endianness) for _ in range(mesh_count)])
+
+
+@dataclasses.dataclass
+class ModelSummary:
+    """Header and mesh summaries of a model."""
+
+    name: str
+    sub_models: list[SubModelSummary]
+    game: GameType
+    endianness: str
+
+
+def read_summary_file(file_path: pathlib.Path) -> ModelSummary:
+    """Read the header and mesh summaries of a model file, seeking over the vertex data."""
+    try:
+        with file_path.open(mode='rb') as file:
+            version, endianness, game_type, name, _ = read_model_header(file)
+
+            sub_model_count = struct.unpack(endianness + 'I', file.read(4))[0]
+
+            sub_models = [skip_sub_model(file, version, endianness) for _ in range(sub_model_count)]
+
+            read_model_footer(file, game_type, endianness)
+
+            if len(file.read(1)) != 0:
+                raise utils.FileReadError
+
+            return ModelSummary(name, sub_models, game_type, endianness)
+
+    except (OSError, struct.error) as exception:
+        raise utils.FileReadError from exception
+
+
 def read_file(file_path: pathlib.Path) -> Model:
     """Read a model file."""
     try:
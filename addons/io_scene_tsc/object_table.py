@@ -0,0 +1,181 @@
+"""Index the animation IDs of the objects in SimsObjects and allobjects files."""
+
+import dataclasses
+import hashlib
+import numpy as np
+import pathlib
+import threading
+
+
+from . import disk_cache
+from . import utils
+
+
+# byte ranges of the object tables, the sims 3 prototype and retail tables are told apart by file size
+TABLE_RANGES = {
+    (utils.GameType.THESIMS, None): (1792468, 1833523),
+    (utils.GameType.THESIMSBUSTINOUT, None): (2867964, 2934816),
+    (utils.GameType.THEURBZ, None): (1566992, 1615672),
+    (utils.GameType.THESIMS2, None): (982304, 1040972),
+    (utils.GameType.THESIMS2PETS, None): (1124496, 1197700),
+    (utils.GameType.THESIMS2CASTAWAY, None): (886652, 946662),
+    (utils.GameType.THESIMS3, 3401865): (1007283, 1235971),
+    (utils.GameType.THESIMS3, 2454265): (847931, 1026640),
+}
+
+
+def get_table_range(game_type: utils.GameType, file_size: int) -> tuple[int, int] | None:
+    """Get the byte range of the object table that holds the model and animation IDs."""
+    table_range = TABLE_RANGES.get((game_type, None))
+    if table_range is not None:
+        return table_range
+
+    return TABLE_RANGES.get((game_type, file_size))
+
+
+@dataclasses.dataclass
+class ObjectTable:
+    """Every 4 byte value of an object table range, sorted, with the value 8 bytes after it.
+
+    Model IDs are not aligned in the table, so a value is indexed at every byte offset.
+    """
+
+    keys: np.ndarray
+    offsets: np.ndarray
+    values: np.ndarray
+    has_values: np.ndarray
+    reverse_values: np.ndarray
+    reverse_keys: np.ndarray
+
+    def find_animation_ids(self, model_id: int) -> tuple[bool, list[int]]:
+        """Get whether the model ID is in the table and the animation IDs stored after each occurrence."""
+        start = np.searchsorted(self.keys, model_id, side='left')
+        end = np.searchsorted(self.keys, model_id, side='right')
+        if start == end:
+            return False, []
+
+        animation_ids = []
+        next_offset = 0
+        for offset, value, has_value in zip(
+            self.offsets[start:end].tolist(),
+            self.values[start:end].tolist(),
+            self.has_values[start:end].tolist(),
+        ):
+            # occurrences overlapping the previous one are skipped, as when searching the table from the end of it
+            if offset < next_offset:
+                continue
+
+            # an occurrence without a complete animation ID after it invalidates the whole lookup
+            if not has_value:
+                return False, []
+
+            animation_ids.append(value)
+            next_offset = offset + 4
+
+        return True, animation_ids
+
+    def find_model_ids(self, animation_id: int) -> list[int]:
+        """Get the values that an animation ID is stored after.
+
+        Every byte offset is indexed, so the result should be filtered by the IDs of existing models.
+        """
+        start = np.searchsorted(self.reverse_values, animation_id, side='left')
+        end = np.searchsorted(self.reverse_values, animation_id, side='right')
+
+        return sorted(set(self.reverse_keys[start:end].tolist()))
+
+
+def create_object_table(data: bytes, endianness: str) -> ObjectTable:
+    """Index the 4 byte value at every offset of an object table range."""
+    data_bytes = np.frombuffer(data, dtype=np.uint8)
+
+    if len(data_bytes) < 4:
+        empty = np.zeros(0, dtype=np.uint32)
+        return ObjectTable(empty, empty, empty, np.zeros(0, dtype=bool), empty, empty)
+
+    windows = np.lib.stride_tricks.sliding_window_view(data_bytes, 4).astype(np.uint32)
+    if endianness == '<':
+        windows = windows[:, ::-1]
+    words = (windows[:, 0] << 24) | (windows[:, 1] << 16) | (windows[:, 2] << 8) | windows[:, 3]
+
+    offsets = np.arange(len(words), dtype=np.uint32)
+    has_values = (offsets + 12) <= len(data_bytes)
+    values = np.zeros(len(words), dtype=np.uint32)
+    values[has_values] = words[offsets[has_values] + 8]
+
+    # a stable sort keeps the offsets of equal values in file order
+    order = np.argsort(words, kind='stable')
+
+    reverse_values = values[has_values]
+    reverse_keys = words[has_values]
+    reverse_order = np.argsort(reverse_values, kind='stable')
+
+    return ObjectTable(
+        words[order],
+        offsets[order],
+        values[order],
+        has_values[order],
+        reverse_values[reverse_order],
+        reverse_keys[reverse_order],
+    )
+
+
+OBJECT_TABLES: dict[tuple[pathlib.Path, int, utils.GameType, str], ObjectTable | None] = {}
+OBJECT_TABLES_LOCK = threading.Lock()
+
+
+def read_object_table(
+    file_path: pathlib.Path,
+    file_size: int,
+    game_type: utils.GameType,
+    endianness: str,
+) -> ObjectTable | None:
+    """Read and index an object table, or get None if it cannot be read."""
+    table_range = get_table_range(game_type, file_size)
+    if table_range is None:
+        return None
+
+    start_position, end_position = table_range
+
+    try:
+        with file_path.open(mode='rb') as file:
+            file.seek(start_position)
+            data = file.read(end_position - start_position)
+    except OSError:
+        return None
+
+    return create_object_table(data, endianness)
+
+
+def get_object_table(
+    file_path: pathlib.Path,
+    file_size: int,
+    game_type: utils.GameType,
+    endianness: str,
+) -> ObjectTable | None:
+    """Get the index of an object table, parsing the file only once per session and caching the index on disk."""
+    key = (file_path, file_size, game_type, endianness)
+
+    with OBJECT_TABLES_LOCK:
+        if key in OBJECT_TABLES:
+            return OBJECT_TABLES[key]
+
+        try:
+            modification_time = file_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+        cache_key = repr((*key, modification_time)).encode()
+        cache_file_name = f"object_table_{hashlib.blake2b(cache_key, digest_size=8).hexdigest()}.npz"
+
+        arrays = disk_cache.read_arrays(cache_file_name)
+        if {x.name for x in dataclasses.fields(ObjectTable)} == arrays.keys():
+            table = ObjectTable(**arrays)
+        else:
+            table = read_object_table(file_path, file_size, game_type, endianness)
+            if table is not None:
+                disk_cache.write_arrays(cache_file_name, dataclasses.asdict(table))
+
+        OBJECT_TABLES[key] = table
+
+        return table
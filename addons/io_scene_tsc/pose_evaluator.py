@@ -0,0 +1,220 @@
+"""Evaluate animation poses with NumPy, without creating fcurves."""
+
+import dataclasses
+import numpy as np
+
+
+from . import animation
+from . import character
+
+
+def multiply_quaternions(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Multiply wxyz quaternions with broadcasting."""
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+
+    return np.stack(
+        (
+            (aw * bw) - (ax * bx) - (ay * by) - (az * bz),
+            (aw * bx) + (ax * bw) + (ay * bz) - (az * by),
+            (aw * by) - (ax * bz) + (ay * bw) + (az * bx),
+            (aw * bz) + (ax * by) - (ay * bx) + (az * bw),
+        ),
+        axis=-1,
+    )
+
+
+def slerp(start: np.ndarray, end: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """Spherically interpolate wxyz quaternions along the shortest path."""
+    dot = np.sum(start * end, axis=-1)
+    end = np.where((dot < 0.0)[..., np.newaxis], -end, end)
+    dot = np.clip(np.abs(dot), 0.0, 1.0)
+
+    angle = np.arccos(dot)
+    sin_angle = np.sin(angle)
+
+    # nearly parallel quaternions fall back to linear interpolation
+    is_linear = sin_angle < 1e-6
+    safe_sin_angle = np.where(is_linear, 1.0, sin_angle)
+    start_weights = np.where(is_linear, 1.0 - factors, np.sin((1.0 - factors) * angle) / safe_sin_angle)
+    end_weights = np.where(is_linear, factors, np.sin(factors * angle) / safe_sin_angle)
+
+    rotations = (start * start_weights[..., np.newaxis]) + (end * end_weights[..., np.newaxis])
+
+    return rotations / np.linalg.norm(rotations, axis=-1, keepdims=True)
+
+
+def lerp(start: np.ndarray, end: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """Linearly interpolate vectors."""
+    return start + ((end - start) * factors[..., np.newaxis])
+
+
+def quaternions_to_matrices(quaternions: np.ndarray) -> np.ndarray:
+    """Convert wxyz quaternions to 3x3 rotation matrices."""
+    w, x, y, z = np.moveaxis(quaternions, -1, 0)
+
+    return np.stack(
+        (
+            np.stack((1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y - w * z), 2.0 * (x * z + w * y)), axis=-1),
+            np.stack((2.0 * (x * y + w * z), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z - w * x)), axis=-1),
+            np.stack((2.0 * (x * z - w * y), 2.0 * (y * z + w * x), 1.0 - 2.0 * (x * x + y * y)), axis=-1),
+        ),
+        axis=-2,
+    )
+
+
+def compose_matrices(translations: np.ndarray, rotations: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Compose 4x4 translation @ rotation @ scale matrices from translations, wxyz quaternions and scales."""
+    matrices = np.zeros((*translations.shape[:-1], 4, 4), dtype=np.float64)
+    matrices[..., :3, :3] = quaternions_to_matrices(rotations) * scales[..., np.newaxis, :]
+    matrices[..., :3, 3] = translations
+    matrices[..., 3, 3] = 1.0
+
+    return matrices
+
+
+def sample_track(track: animation.Track, frames: np.ndarray, rest_value: tuple[float, ...]) -> np.ndarray:
+    """Sample a track at frames, holding the first and last keyframes. Tracks without keyframes stay at rest."""
+    if len(track) == 0:
+        return np.broadcast_to(np.array(rest_value, dtype=np.float64), (len(frames), len(rest_value)))
+
+    values = track.values.astype(np.float64)
+    if values.shape[1] == 4:
+        # static rotations are stored unnormalized
+        values = animation.normalize_quaternions(values)
+
+    if len(track) == 1:
+        return np.broadcast_to(values[0], (len(frames), values.shape[1]))
+
+    key_frames = track.frames.astype(np.float64)
+
+    start = np.clip(np.searchsorted(key_frames, frames, side='right') - 1, 0, len(track) - 2)
+    end = start + 1
+
+    factors = np.clip((frames - key_frames[start]) / (key_frames[end] - key_frames[start]), 0.0, 1.0)
+
+    if values.shape[1] == 4:
+        return slerp(values[start], values[end], factors)
+
+    return lerp(values[start], values[end], factors)
+
+
+@dataclasses.dataclass
+class PoseSamples:
+    """Animation tracks sampled at frames, indexed by frame then bone."""
+
+    frames: np.ndarray
+    rotations: np.ndarray
+    scales: np.ndarray
+    locations: np.ndarray
+
+
+def sample_animation(anim: animation.Animation, frames: np.ndarray) -> PoseSamples:
+    """Sample every track of an animation at frames."""
+    frames = np.asarray(frames, dtype=np.float64)
+
+    rotations = np.empty((len(frames), len(anim.bones), 4), dtype=np.float64)
+    scales = np.empty((len(frames), len(anim.bones), 3), dtype=np.float64)
+    locations = np.empty((len(frames), len(anim.bones), 3), dtype=np.float64)
+
+    for bone_index, bone in enumerate(anim.bones):
+        rotations[:, bone_index] = sample_track(bone.rotation, frames, (1.0, 0.0, 0.0, 0.0))
+        scales[:, bone_index] = sample_track(bone.scale, frames, (1.0, 1.0, 1.0))
+        locations[:, bone_index] = sample_track(bone.location, frames, (0.0, 0.0, 0.0))
+
+    return PoseSamples(frames, rotations, scales, locations)
+
+
+@dataclasses.dataclass
+class Skeleton:
+    """Rest pose of a character in model space, with the bones grouped by their depth in the hierarchy."""
+
+    parents: np.ndarray
+    rest_rotations: np.ndarray
+    rest_translations: np.ndarray
+    inverse_rest_matrices: np.ndarray
+    depth_levels: list[np.ndarray]
+
+
+def create_skeleton(char_desc: character.Character) -> Skeleton:
+    """Create the skeleton of a character."""
+    bone_count = len(char_desc.bones)
+
+    parents = np.full(bone_count, -1, dtype=np.int64)
+    for bone_index, bone in enumerate(char_desc.bones):
+        parents[bone.children] = bone_index
+
+    depths = np.zeros(bone_count, dtype=np.int64)
+    for bone_index in range(bone_count):
+        parent_index = parents[bone_index]
+        while parent_index >= 0:
+            depths[bone_index] += 1
+            parent_index = parents[parent_index]
+
+    rest_rotations = np.array([tuple(x.rotation) for x in char_desc.bones], dtype=np.float64).reshape(-1, 4)
+    rest_translations = np.array([tuple(x.translation) for x in char_desc.bones], dtype=np.float64).reshape(-1, 3)
+    rest_matrices = compose_matrices(rest_translations, rest_rotations, np.ones((bone_count, 3)))
+
+    return Skeleton(
+        parents,
+        rest_rotations,
+        rest_translations,
+        np.linalg.inv(rest_matrices),
+        [np.flatnonzero(depths == x) for x in range(int(depths.max(initial=-1)) + 1)],
+    )
+
+
+@dataclasses.dataclass
+class Pose:
+    """Bone transforms at frames, indexed by frame then bone."""
+
+    frames: np.ndarray
+    local_matrices: np.ndarray
+    world_matrices: np.ndarray
+
+
+def evaluate_local_matrices(skeleton: Skeleton, samples: PoseSamples) -> np.ndarray:
+    """Evaluate the model space transform of every bone as if its parent were at rest.
+
+    Animation rotations and locations are offsets from the rest pose in model space.
+    """
+    return compose_matrices(
+        skeleton.rest_translations + samples.locations,
+        multiply_quaternions(samples.rotations, skeleton.rest_rotations),
+        samples.scales,
+    )
+
+
+def evaluate_world_matrices(skeleton: Skeleton, local_matrices: np.ndarray) -> np.ndarray:
+    """Evaluate the model space transform of every bone, carrying the movement of the parents down the hierarchy."""
+    world_matrices = np.empty_like(local_matrices)
+
+    for bone_indices in skeleton.depth_levels:
+        parent_indices = skeleton.parents[bone_indices]
+        is_root = parent_indices < 0
+
+        roots = bone_indices[is_root]
+        world_matrices[:, roots] = local_matrices[:, roots]
+
+        children = bone_indices[~is_root]
+        child_parents = parent_indices[~is_root]
+        world_matrices[:, children] = (
+            world_matrices[:, child_parents]
+            @ skeleton.inverse_rest_matrices[child_parents]
+            @ local_matrices[:, children]
+        )
+
+    return world_matrices
+
+
+def evaluate_pose(char_desc: character.Character, anim: animation.Animation, frames: np.ndarray) -> Pose:
+    """Evaluate the local and world bone transforms of an animation at frames."""
+    if len(char_desc.bones) != len(anim.bones):
+        msg = f"Animation {anim.name} does not have the bone count of character {char_desc.name}"
+        raise ValueError(msg)
+
+    skeleton = create_skeleton(char_desc)
+    samples = sample_animation(anim, frames)
+    local_matrices = evaluate_local_matrices(skeleton, samples)
+
+    return Pose(samples.frames, local_matrices, evaluate_world_matrices(skeleton, local_matrices))
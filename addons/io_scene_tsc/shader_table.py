@@ -0,0 +1,234 @@
+"""Table of the resolved shaders of a game, built from every shader file at once and persisted."""
+
+import collections.abc
+import concurrent.futures
+import dataclasses
+import hashlib
+import os
+import pathlib
+import threading
+
+
+from . import disk_cache
+from . import game_root
+from . import model
+from . import shader
+from . import utils
+
+
+def get_has_alpha(game_type: utils.GameType, render_pass: shader.RenderPass) -> bool:
+    """Check whether a render pass blends with the texture alpha."""
+    match game_type:
+        case utils.GameType.THESIMS | utils.GameType.THESIMSBUSTINOUT:
+            return render_pass.flags & 0x4 != 0
+        case (
+            utils.GameType.THEURBZ
+            | utils.GameType.THESIMS2
+            | utils.GameType.THESIMS2PETS
+            | utils.GameType.THESIMS2CASTAWAY
+        ):
+            return render_pass.raster_modes & 0x40 != 0 or render_pass.flags & 0x4 != 0
+
+    return False
+
+
+@dataclasses.dataclass(frozen=True)
+class ShaderTableEntry:
+    """Material parameters of a shader, or of the shader a shader IDs file points to."""
+
+    name: str
+    texture_id: int
+    has_alpha: bool
+    diffuse_color: tuple[float, float, float]
+    sort_value: int
+
+
+def read_shader_entry(
+    file_path: pathlib.Path,
+    game_type: utils.GameType,
+    endianness: str,
+) -> ShaderTableEntry | int | None:
+    """Read the entry of a shader file, the ID of the shader a shader IDs file points to, or None."""
+    try:
+        shader_desc = shader.read_file(file_path, game_type, endianness)
+    except utils.FileReadError as _:
+        return None
+
+    if type(shader_desc) is shader.ShaderIDs:
+        return shader_desc.ids[-1] if shader_desc.ids else None
+
+    if shader_desc is None or not shader_desc.render_passes:
+        return None
+
+    render_pass = shader_desc.render_passes[0]
+
+    return ShaderTableEntry(
+        file_path.stem,
+        render_pass.texture_id,
+        get_has_alpha(game_type, render_pass),
+        tuple(shader_desc.diffuse_color),
+        shader_desc.sort_value,
+    )
+
+
+def resolve_shader_entries(records: dict[int, ShaderTableEntry | int | None]) -> dict[int, ShaderTableEntry]:
+    """Follow the chains of shader IDs files to the shaders they end at."""
+    entries = {}
+
+    for shader_id, record in records.items():
+        resolved_record = record
+        visited = {shader_id}
+        while type(resolved_record) is int and resolved_record not in visited:
+            visited.add(resolved_record)
+            resolved_record = records.get(resolved_record)
+
+        if type(resolved_record) is ShaderTableEntry:
+            entries[shader_id] = resolved_record
+
+    return entries
+
+
+def build_shader_table(
+    shader_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+    game_type: utils.GameType,
+    endianness: str,
+) -> dict[int, ShaderTableEntry]:
+    """Read every shader file in parallel and resolve the shader IDs files."""
+    items = list(shader_file_path_id_map.items())
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        records = executor.map(
+            read_shader_entry,
+            [x[1] for x in items],
+            [game_type] * len(items),
+            [endianness] * len(items),
+        )
+
+        return resolve_shader_entries(dict(zip([x[0] for x in items], records)))
+
+
+def get_file_signature(file_path: pathlib.Path) -> str:
+    """Get the size and modification time of a file, or an empty string if it cannot be read."""
+    try:
+        stat = file_path.stat()
+    except OSError as _:
+        return ""
+
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def get_table_signature(shader_file_path_id_map: collections.abc.Mapping[int, pathlib.Path]) -> str:
+    """Get a hash of the paths, sizes and modification times of the shader files of a map."""
+    signature = hashlib.blake2b(digest_size=16)
+    for shader_id, file_path in sorted(shader_file_path_id_map.items()):
+        signature.update(f"{shader_id}:{file_path}:{get_file_signature(file_path)}\n".encode())
+
+    return signature.hexdigest()
+
+
+def get_root_table_signature(game_root_index: game_root.GameRootIndex) -> str:
+    """Get the signature of the shader files of a game root, hashed only once for each of its shader maps."""
+    shader_file_path_id_map = game_root_index.shaders
+
+    # the shader map is replaced when the game root index changes, which also invalidates the signature
+    cached_signature = game_root_index.shader_table_signature
+    if cached_signature is not None and cached_signature[0] is shader_file_path_id_map:
+        return cached_signature[1]
+
+    signature = get_table_signature(shader_file_path_id_map)
+    game_root_index.shader_table_signature = (shader_file_path_id_map, signature)
+
+    return signature
+
+
+def get_table_file_name(root: pathlib.Path, game_type: utils.GameType, endianness: str) -> str:
+    """Get the cache file name of the shader table of a game root."""
+    table_hash = hashlib.blake2b(f"{root}|{game_type.name}|{endianness}".encode(), digest_size=8).hexdigest()
+    return f"shader_table_{table_hash}.json"
+
+
+SHADER_TABLES: dict[
+    tuple[pathlib.Path, utils.GameType, str],
+    tuple[collections.abc.Mapping[int, pathlib.Path], dict[int, ShaderTableEntry] | None],
+] = {}
+SHADER_TABLES_LOCK = threading.Lock()
+
+
+def create_shader_table(
+    game_root_index: game_root.GameRootIndex,
+    game_type: utils.GameType,
+    endianness: str,
+) -> dict[int, ShaderTableEntry]:
+    """Build the shader table of a game root and write it to the cache file."""
+    shader_file_path_id_map = game_root_index.shaders
+    entries = build_shader_table(shader_file_path_id_map, game_type, endianness)
+
+    # the shader files are hashed again, as they may have changed since the signature was last hashed this session
+    signature = get_table_signature(shader_file_path_id_map)
+    game_root_index.shader_table_signature = (shader_file_path_id_map, signature)
+
+    disk_cache.write_json(
+        get_table_file_name(game_root_index.root, game_type, endianness),
+        {
+            "signature": signature,
+            "entries": {str(x): dataclasses.astuple(entry) for x, entry in entries.items()},
+        },
+    )
+
+    with SHADER_TABLES_LOCK:
+        SHADER_TABLES[game_root_index.root, game_type, endianness] = (shader_file_path_id_map, entries)
+
+    return entries
+
+
+def read_shader_table(
+    game_root_index: game_root.GameRootIndex,
+    game_type: utils.GameType,
+    endianness: str,
+) -> dict[int, ShaderTableEntry] | None:
+    """Read the shader table of a game root from its cache file, or None if it is missing or out of date."""
+    table = disk_cache.read_json(get_table_file_name(game_root_index.root, game_type, endianness))
+
+    # most game roots never get a shader table, so their shader files are not hashed
+    if "signature" not in table or table["signature"] != get_root_table_signature(game_root_index):
+        return None
+
+    try:
+        return {
+            int(x): ShaderTableEntry(name, texture_id, has_alpha, tuple(diffuse_color), sort_value)
+            for x, (name, texture_id, has_alpha, diffuse_color, sort_value) in table["entries"].items()
+        }
+    except (KeyError, TypeError, ValueError) as _:
+        return None
+
+
+def get_shader_table(
+    game_root_index: game_root.GameRootIndex,
+    game_type: utils.GameType,
+    endianness: str,
+) -> dict[int, ShaderTableEntry] | None:
+    """Get the shader table of a game root if it has been built for its current shader files."""
+    key = (game_root_index.root, game_type, endianness)
+
+    with SHADER_TABLES_LOCK:
+        cached_table = SHADER_TABLES.get(key)
+
+        # the shader map is replaced when the game root index changes, which also invalidates the table
+        if cached_table is not None and cached_table[0] is game_root_index.shaders:
+            return cached_table[1]
+
+        entries = read_shader_table(game_root_index, game_type, endianness)
+        SHADER_TABLES[key] = (game_root_index.shaders, entries)
+
+        return entries
+
+
+def detect_game_type(game_root_index: game_root.GameRootIndex) -> tuple[utils.GameType, str] | None:
+    """Detect the game type and endianness of a game root from the first model file that can be read."""
+    for file_path in game_root_index.models.values():
+        try:
+            return model.read_file_game_type(file_path)
+        except utils.FileReadError as _:
+            continue
+
+    return None
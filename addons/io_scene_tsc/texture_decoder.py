@@ -0,0 +1,334 @@
+"""Decode png and tga textures to RGBA pixels with NumPy and zlib, so they can be decoded off the main thread."""
+
+import dataclasses
+import numpy as np
+import pathlib
+import struct
+import zlib
+
+
+from . import texture_info
+
+
+# png color types and their sample counts per pixel, palette pixels are a single index
+PNG_COLOR_TYPE_SAMPLES = {
+    0: 1,  # grayscale
+    2: 3,  # rgb
+    3: 1,  # palette
+    4: 2,  # grayscale and alpha
+    6: 4,  # rgba
+}
+
+
+@dataclasses.dataclass
+class DecodedTexture:
+    """RGBA pixels from 0 to 1 in Blender order, starting at the bottom left."""
+
+    width: int
+    height: int
+    pixels: np.ndarray
+
+
+def paeth_predictor(left: np.ndarray, up: np.ndarray, up_left: np.ndarray) -> np.ndarray:
+    """Predict bytes from the neighbor closest to left + up - up left."""
+    estimate = left + up - up_left
+    left_distance = np.abs(estimate - left)
+    up_distance = np.abs(estimate - up)
+    up_left_distance = np.abs(estimate - up_left)
+
+    return np.where(
+        (left_distance <= up_distance) & (left_distance <= up_left_distance),
+        left,
+        np.where(up_distance <= up_left_distance, up, up_left),
+    )
+
+
+def unfilter_scanlines(filtered: np.ndarray, filter_types: np.ndarray, bytes_per_pixel: int) -> np.ndarray | None:
+    """Reverse the png filters of every scanline.
+
+    Scanlines with only none, sub and up filters are reversed one row at a time. Average and paeth filters depend on the
+    left, upper and upper left pixels, so those images are reversed one anti-diagonal of pixels at a time instead.
+    """
+    height, stride = filtered.shape
+    if np.any(filter_types > 4) or stride % bytes_per_pixel != 0:
+        return None
+
+    column_count = stride // bytes_per_pixel
+    filtered = filtered.reshape(height, column_count, bytes_per_pixel)
+
+    if np.all(filter_types <= 2):
+        rows = np.empty_like(filtered)
+        previous_row = np.zeros((column_count, bytes_per_pixel), dtype=np.uint8)
+        for y, filter_type in enumerate(filter_types.tolist()):
+            match filter_type:
+                case 0:
+                    rows[y] = filtered[y]
+                case 1:
+                    rows[y] = np.cumsum(filtered[y], axis=0, dtype=np.uint8)
+                case 2:
+                    rows[y] = filtered[y] + previous_row
+            previous_row = rows[y]
+
+        return rows.reshape(height, stride)
+
+    # the rows and columns are padded with zeros at the start for the missing neighbors of the first pixels
+    padded_rows = np.zeros((height + 1, column_count + 1, bytes_per_pixel), dtype=np.int16)
+    filtered = filtered.astype(np.int16)
+
+    for diagonal in range(height + column_count - 1):
+        ys = np.arange(max(0, diagonal - column_count + 1), min(height, diagonal + 1))
+        xs = diagonal - ys
+
+        left = padded_rows[ys + 1, xs]
+        up = padded_rows[ys, xs + 1]
+        up_left = padded_rows[ys, xs]
+        row_filter_types = filter_types[ys][:, np.newaxis]
+
+        prediction = np.select(
+            (row_filter_types == 1, row_filter_types == 2, row_filter_types == 3, row_filter_types == 4),
+            (left, up, (left + up) >> 1, paeth_predictor(left, up, up_left)),
+            0,
+        )
+
+        padded_rows[ys + 1, xs + 1] = (filtered[ys, xs] + prediction) & 0xFF
+
+    return padded_rows[1:, 1:].astype(np.uint8).reshape(height, stride)
+
+
+def unpack_samples(rows: np.ndarray, width: int, sample_count: int, bit_depth: int) -> np.ndarray:
+    """Unpack the samples of png scanlines to an array of height by width by samples."""
+    height = rows.shape[0]
+
+    match bit_depth:
+        case 8:
+            return rows.reshape(height, width, sample_count).astype(np.uint16)
+        case 16:
+            return rows.view('>u2').reshape(height, width, sample_count).astype(np.uint16)
+
+    bits = np.unpackbits(rows, axis=1).reshape(height, -1, bit_depth)
+    weights = 1 << np.arange(bit_depth - 1, -1, -1, dtype=np.uint16)
+
+    return (bits @ weights)[:, :width, np.newaxis].astype(np.uint16)
+
+
+def convert_png_samples(
+    samples: np.ndarray,
+    color_type: int,
+    bit_depth: int,
+    palette: bytes | None,
+    transparency: bytes | None,
+) -> np.ndarray | None:
+    """Convert png samples to RGBA pixels from 0 to 1."""
+    height, width, _ = samples.shape
+    max_value = float((1 << bit_depth) - 1)
+
+    pixels = np.ones((height, width, 4), dtype=np.float32)
+
+    match color_type:
+        case 0:
+            pixels[..., :3] = samples / max_value
+            if transparency is not None and len(transparency) >= 2:
+                pixels[..., 3] = samples[..., 0] != struct.unpack('>H', transparency[:2])[0]
+        case 2:
+            pixels[..., :3] = samples / max_value
+            if transparency is not None and len(transparency) >= 6:
+                pixels[..., 3] = np.any(samples != struct.unpack('>3H', transparency[:6]), axis=2)
+        case 3:
+            if palette is None or len(palette) < 3:
+                return None
+
+            palette_colors = np.frombuffer(palette[: len(palette) // 3 * 3], dtype=np.uint8).reshape(-1, 3)
+            palette_alphas = np.full(len(palette_colors), 255, dtype=np.uint8)
+            if transparency is not None:
+                alpha_count = min(len(transparency), len(palette_colors))
+                palette_alphas[:alpha_count] = np.frombuffer(transparency[:alpha_count], dtype=np.uint8)
+
+            palette_pixels = np.column_stack((palette_colors, palette_alphas)).astype(np.float32) / 255.0
+            pixels = palette_pixels[np.minimum(samples[..., 0], len(palette_colors) - 1)]
+        case 4:
+            pixels[..., :3] = samples[..., :1] / max_value
+            pixels[..., 3] = samples[..., 1] / max_value
+        case 6:
+            pixels[:] = samples / max_value
+
+    return pixels
+
+
+@dataclasses.dataclass
+class PNGChunks:
+    """Chunks of a png needed to decode it."""
+
+    header: tuple[int, int, int, int, int, int, int]
+    palette: bytes | None
+    transparency: bytes | None
+    image_data: bytes
+
+
+def read_png_chunks(data: bytes) -> PNGChunks | None:
+    """Read the header, palette, transparency and joined image data chunks of a png."""
+    if not data.startswith(texture_info.PNG_SIGNATURE):
+        return None
+
+    header = None
+    palette = None
+    transparency = None
+    image_data = []
+
+    position = len(texture_info.PNG_SIGNATURE)
+    while position + 8 <= len(data):
+        length, chunk_type = struct.unpack_from('>I4s', data, position)
+        chunk = data[position + 8 : position + 8 + length]
+        position += length + 12
+
+        match chunk_type:
+            case b'IHDR':
+                header = struct.unpack('>IIBBBBB', chunk[:13])
+            case b'PLTE':
+                palette = chunk
+            case b'tRNS':
+                transparency = chunk
+            case b'IDAT':
+                image_data.append(chunk)
+            case b'IEND':
+                break
+
+    if header is None:
+        return None
+
+    return PNGChunks(header, palette, transparency, b''.join(image_data))
+
+
+def decompress_scanlines(image_data: bytes, height: int, stride: int) -> np.ndarray | None:
+    """Decompress the png image data to scanlines, each starting with its filter type."""
+    try:
+        scanlines = np.frombuffer(zlib.decompress(image_data), dtype=np.uint8)
+    except zlib.error as _:
+        return None
+
+    if len(scanlines) < height * (stride + 1):
+        return None
+
+    return scanlines[: height * (stride + 1)].reshape(height, stride + 1)
+
+
+def decode_png(data: bytes) -> DecodedTexture | None:
+    """Decode a non-interlaced png, or get None if it cannot be decoded."""
+    chunks = read_png_chunks(data)
+    if chunks is None:
+        return None
+
+    width, height, bit_depth, color_type, _, _, interlace_method = chunks.header
+    sample_count = PNG_COLOR_TYPE_SAMPLES.get(color_type)
+    if sample_count is None or interlace_method != 0 or bit_depth not in (1, 2, 4, 8, 16) or width * height == 0:
+        return None
+
+    bits_per_pixel = sample_count * bit_depth
+    stride = ((width * bits_per_pixel) + 7) // 8
+
+    scanlines = decompress_scanlines(chunks.image_data, height, stride)
+    if scanlines is None:
+        return None
+
+    rows = unfilter_scanlines(scanlines[:, 1:], scanlines[:, 0], max(1, bits_per_pixel // 8))
+    if rows is None:
+        return None
+
+    pixels = convert_png_samples(
+        unpack_samples(rows, width, sample_count, bit_depth),
+        color_type,
+        bit_depth,
+        chunks.palette,
+        chunks.transparency,
+    )
+    if pixels is None:
+        return None
+
+    return DecodedTexture(width, height, np.ascontiguousarray(pixels[::-1]))
+
+
+def decode_tga_run_lengths(data: bytes, position: int, pixel_count: int, bytes_per_pixel: int) -> bytes | None:
+    """Decode run length encoded tga pixels."""
+    pixels = bytearray()
+    end = pixel_count * bytes_per_pixel
+
+    while len(pixels) < end and position < len(data):
+        packet = data[position]
+        count = (packet & 0x7F) + 1
+        position += 1
+
+        if packet & 0x80:
+            pixels += data[position : position + bytes_per_pixel] * count
+            position += bytes_per_pixel
+        else:
+            pixels += data[position : position + (count * bytes_per_pixel)]
+            position += count * bytes_per_pixel
+
+    if len(pixels) < end:
+        return None
+
+    return bytes(pixels[:end])
+
+
+def decode_tga(data: bytes) -> DecodedTexture | None:
+    """Decode a true color or grayscale tga, or get None if it cannot be decoded."""
+    if len(data) < 18:
+        return None
+
+    id_length, color_map_type, image_type = data[0], data[1], data[2]
+    width, height, pixel_depth, descriptor = struct.unpack_from('<HHBB', data, 12)
+
+    # color mapped and right to left images are left to blender
+    if color_map_type != 0 or image_type not in (2, 3, 10, 11) or descriptor & 0x10 or width * height == 0:
+        return None
+
+    bytes_per_pixel = pixel_depth // 8
+    if (image_type in (2, 10) and bytes_per_pixel not in (3, 4)) or (image_type in (3, 11) and bytes_per_pixel != 1):
+        return None
+
+    position = 18 + id_length
+    pixel_count = width * height
+
+    if image_type in (10, 11):
+        pixel_data = decode_tga_run_lengths(data, position, pixel_count, bytes_per_pixel)
+        if pixel_data is None:
+            return None
+    else:
+        pixel_data = data[position : position + (pixel_count * bytes_per_pixel)]
+        if len(pixel_data) < pixel_count * bytes_per_pixel:
+            return None
+
+    samples = np.frombuffer(pixel_data, dtype=np.uint8).reshape(height, width, bytes_per_pixel)
+
+    pixels = np.ones((height, width, 4), dtype=np.float32)
+    if bytes_per_pixel == 1:
+        pixels[..., :3] = samples / 255.0
+    else:
+        pixels[..., :3] = samples[..., 2::-1] / 255.0
+        if bytes_per_pixel == 4:
+            pixels[..., 3] = samples[..., 3] / 255.0
+
+    # tga rows start at the bottom like blender unless the top origin bit is set
+    if descriptor & 0x20:
+        pixels = pixels[::-1]
+
+    return DecodedTexture(width, height, np.ascontiguousarray(pixels))
+
+
+def decode_texture(file_path: pathlib.Path) -> DecodedTexture | None:
+    """Decode a png or tga texture file, or get None if it cannot be decoded here and has to be loaded by Blender."""
+    try:
+        data = file_path.read_bytes()
+    except OSError:
+        return None
+
+    try:
+        if data.startswith(texture_info.PNG_SIGNATURE):
+            return decode_png(data)
+
+        if file_path.suffix.lower() == '.tga':
+            return decode_tga(data)
+
+    except (struct.error, ValueError) as _:
+        return None
+
+    return None
@@ -0,0 +1,210 @@
+"""Read the size and alpha of textures from the headers of their image files."""
+
+import collections.abc
+import dataclasses
+import pathlib
+import struct
+import threading
+import typing
+
+
+from . import checksum
+from . import disk_cache
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# png color types and their channel counts
+PNG_COLOR_TYPE_CHANNELS = {
+    0: 1,  # grayscale
+    2: 3,  # rgb
+    3: 3,  # palette
+    4: 2,  # grayscale and alpha
+    6: 4,  # rgba
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class TextureInfo:
+    """Texture size, bits per pixel and whether it has an alpha channel."""
+
+    width: int
+    height: int
+    depth: int
+    has_alpha: bool
+
+
+def read_png_info(file: typing.BinaryIO) -> TextureInfo | None:
+    """Read the png header and look for a transparency chunk before the image data."""
+    length, chunk_type = struct.unpack('>I4s', file.read(8))
+    if chunk_type != b'IHDR' or length != 13:
+        return None
+
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', file.read(10))
+    channel_count = PNG_COLOR_TYPE_CHANNELS.get(color_type)
+    if channel_count is None:
+        return None
+
+    file.read(3 + 4)  # compression, filter and interlace methods, crc
+
+    has_alpha = color_type in (4, 6)
+
+    while not has_alpha:
+        chunk_header = file.read(8)
+        if len(chunk_header) != 8:
+            break
+
+        length, chunk_type = struct.unpack('>I4s', chunk_header)
+        if chunk_type in (b'IDAT', b'IEND'):
+            break
+        if chunk_type == b'tRNS':
+            has_alpha = True
+            channel_count += 1
+            break
+
+        file.seek(length + 4, 1)
+
+    # palette entries are always 8 bit
+    depth = (8 if color_type == 3 else bit_depth) * channel_count
+
+    return TextureInfo(width, height, depth, has_alpha)
+
+
+def read_tga_info(header: bytes) -> TextureInfo | None:
+    """Read the tga header."""
+    color_map_type, image_type = header[1], header[2]
+    if color_map_type not in (0, 1) or image_type not in (1, 2, 3, 9, 10, 11):
+        return None
+
+    color_map_depth = header[7]
+    width, height, pixel_depth, descriptor = struct.unpack('<HHBB', header[12:18])
+
+    depth = color_map_depth if color_map_type == 1 else pixel_depth
+
+    return TextureInfo(width, height, depth, (descriptor & 0x0F) != 0 or depth == 32)
+
+
+def read_bmp_info(header: bytes) -> TextureInfo | None:
+    """Read the bmp info header."""
+    info_header_size, width, height, _, bit_count = struct.unpack('<IiiHH', header[14:30])
+    if info_header_size < 40:
+        return None
+
+    return TextureInfo(abs(width), abs(height), bit_count, bit_count == 32)
+
+
+def read_texture_info(file_path: pathlib.Path) -> TextureInfo | None:
+    """Read the texture info of a png, tga or bmp file, or None if it is not one of them."""
+    try:
+        with file_path.open(mode='rb') as file:
+            header = file.read(30)
+
+            if header.startswith(PNG_SIGNATURE):
+                file.seek(len(PNG_SIGNATURE))
+                return read_png_info(file)
+
+            if len(header) < 30:
+                return None
+
+            if header.startswith(b'BM'):
+                return read_bmp_info(header)
+
+            if file_path.suffix.lower() == '.tga':
+                return read_tga_info(header)
+
+    except (OSError, struct.error) as _:
+        return None
+
+    return None
+
+
+def find_specular_file_path(
+    texture_file_path: pathlib.Path,
+    texture_file_path_id_map: collections.abc.Mapping[int, pathlib.Path],
+) -> pathlib.Path | None:
+    """Find the "<stem> specular" texture next to a texture in the texture map, without checking the file system."""
+    specular_file_path = texture_file_path.with_name(texture_file_path.stem + " specular" + texture_file_path.suffix)
+
+    if texture_file_path_id_map.get(checksum.calculate(specular_file_path.stem)) == specular_file_path:
+        return specular_file_path
+
+    return None
+
+
+TEXTURE_INFO_TABLE_FILE_NAME = "texture_info.json"
+
+
+class TextureInfoTable:
+    """Persisted texture info of image files, keyed by path and validated by size and modification time.
+
+    Each file is checked at most once per session, after which its info is returned without any file system access.
+    """
+
+    records: dict[str, list] | None
+    infos: dict[pathlib.Path, TextureInfo | None]
+    is_modified: bool
+    lock: threading.Lock
+
+    def __init__(self) -> None:
+        """Initialize a TextureInfoTable."""
+        self.records = None
+        self.infos = {}
+        self.is_modified = False
+        self.lock = threading.Lock()
+
+    def get_records(self) -> dict[str, list]:
+        """Get the records, reading them from the cache file the first time."""
+        if self.records is None:
+            self.records = disk_cache.read_json(TEXTURE_INFO_TABLE_FILE_NAME)
+
+        return self.records
+
+    def get(self, file_path: pathlib.Path) -> TextureInfo | None:
+        """Get the texture info of an image file, reading its header if it changed since it was recorded."""
+        with self.lock:
+            if file_path in self.infos:
+                return self.infos[file_path]
+
+            record = self.get_records().get(str(file_path))
+
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+
+        if record is not None and record[:2] == [stat.st_size, stat.st_mtime_ns]:
+            info = TextureInfo(*record[2:]) if len(record) == 6 else None
+        else:
+            info = read_texture_info(file_path)
+            record = [stat.st_size, stat.st_mtime_ns]
+            if info is not None:
+                record += [info.width, info.height, info.depth, info.has_alpha]
+
+            with self.lock:
+                self.get_records()[str(file_path)] = record
+                self.is_modified = True
+
+        with self.lock:
+            self.infos[file_path] = info
+
+        return info
+
+    def save(self) -> None:
+        """Write the records to the cache file if they changed."""
+        with self.lock:
+            if self.records is not None and self.is_modified:
+                disk_cache.write_json(TEXTURE_INFO_TABLE_FILE_NAME, self.records)
+                self.is_modified = False
+
+
+TEXTURE_INFO_TABLE = TextureInfoTable()
+
+
+def get_texture_info(file_path: pathlib.Path) -> TextureInfo | None:
+    """Get the texture info of an image file."""
+    return TEXTURE_INFO_TABLE.get(file_path)
+
+
+def save_texture_info_table() -> None:
+    """Write the texture info of the read image files to the cache file."""
+    TEXTURE_INFO_TABLE.save()
@@ -0,0 +1,111 @@
+"""Downscaled proxies of textures, cached as png files for imports that only need the layout."""
+
+import hashlib
+import numpy as np
+import os
+import pathlib
+import struct
+import zlib
+
+
+from . import disk_cache
+from . import texture_decoder
+from . import texture_info
+
+
+PROXY_DIRECTORY_NAME = "texture_proxies"
+
+
+def get_proxy_directory() -> pathlib.Path:
+    """Get the directory of the proxy files, creating it if needed."""
+    proxy_directory = disk_cache.get_cache_directory() / PROXY_DIRECTORY_NAME
+    proxy_directory.mkdir(exist_ok=True)
+    return proxy_directory
+
+
+def get_proxy_file_name(file_path: pathlib.Path, stat: os.stat_result, max_size: int) -> str:
+    """Get the proxy file name of a texture, which changes when the texture file changes."""
+    key = f"{file_path}|{stat.st_size}|{stat.st_mtime_ns}|{max_size}"
+    return f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.png"
+
+
+def get_downscale_factor(size: int, max_size: int) -> int:
+    """Get the power of two a side has to be divided by to fit in the maximum size."""
+    factor = 1
+    while size // factor > max_size:
+        factor *= 2
+
+    return factor
+
+
+def downscale(pixels: np.ndarray, max_size: int) -> np.ndarray:
+    """Average blocks of pixels until each side fits in the maximum size, as the UVs do not depend on the aspect."""
+    height, width, _ = pixels.shape
+
+    factor_y = get_downscale_factor(height, max_size)
+    factor_x = get_downscale_factor(width, max_size)
+    cropped_height = height // factor_y * factor_y
+    cropped_width = width // factor_x * factor_x
+
+    blocks = pixels[:cropped_height, :cropped_width].reshape(
+        cropped_height // factor_y,
+        factor_y,
+        cropped_width // factor_x,
+        factor_x,
+        4,
+    )
+
+    return blocks.mean(axis=(1, 3))
+
+
+def create_png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Create a png chunk with its length and crc."""
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+
+def encode_png(pixels: np.ndarray) -> bytes:
+    """Encode RGBA pixels from 0 to 1 in Blender order as an 8 bit png."""
+    height, width, _ = pixels.shape
+
+    rows = np.round(np.clip(pixels[::-1], 0.0, 1.0) * 255.0).astype(np.uint8).reshape(height, width * 4)
+    scanlines = np.hstack((np.zeros((height, 1), dtype=np.uint8), rows))
+
+    return (
+        texture_info.PNG_SIGNATURE
+        + create_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+        + create_png_chunk(b'IDAT', zlib.compress(scanlines.tobytes()))
+        + create_png_chunk(b'IEND', b'')
+    )
+
+
+def create_proxy(file_path: pathlib.Path, proxy_directory: pathlib.Path, max_size: int) -> pathlib.Path | None:
+    """Get the proxy file of a texture, creating it the first time.
+
+    Get None if the texture already fits in the maximum size or cannot be decoded.
+    """
+    texture = texture_info.get_texture_info(file_path)
+    if texture is not None and max(texture.width, texture.height) <= max_size:
+        return None
+
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+
+    proxy_file_path = proxy_directory / get_proxy_file_name(file_path, stat, max_size)
+    if proxy_file_path.is_file():
+        return proxy_file_path
+
+    decoded_texture = texture_decoder.decode_texture(file_path)
+    if decoded_texture is None or max(decoded_texture.width, decoded_texture.height) <= max_size:
+        return None
+
+    temporary_file_path = proxy_file_path.with_name(proxy_file_path.name + f".{os.getpid()}.tmp")
+
+    try:
+        temporary_file_path.write_bytes(encode_png(downscale(decoded_texture.pixels, max_size)))
+        temporary_file_path.replace(proxy_file_path)
+    except OSError:
+        return None
+
+    return proxy_file_path